@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark harness for AutoAPI.
+
+Generates a synthetic package (see :mod:`synthetic`) and times the
+construction and traversal of its :class:`autoapi.APINode` tree, and the
+rendering of its pages by the Sphinx ``builder-inited`` hook against a stub
+Sphinx application.
+
+Results are written as JSON, and can be compared against the results of a
+previous run to detect regressions:
+
+::
+
+   python3 benchmark/run.py --output new.json --compare old.json
+"""
+
+import sys
+import json
+import platform
+from shutil import rmtree
+from pathlib import Path
+from time import perf_counter
+from tempfile import mkdtemp
+from types import SimpleNamespace
+from importlib import invalidate_caches
+from argparse import ArgumentParser
+from os.path import join
+
+from synthetic import generate
+
+from autoapi import APINode, __version__
+from autoapi import sphinx as autoapi_sphinx
+
+
+PACKAGE = 'autoapi_synthetic'
+
+
+class StubApp(object):
+    """
+    Minimal stand-in of a Sphinx application for the ``builder-inited`` hook.
+
+    The configuration values and their defaults are the ones registered by
+    :func:`autoapi.sphinx.setup`.
+
+    :param str srcdir: Source directory of the documentation.
+    :param dict config: Configuration values to override.
+    """
+
+    def __init__(self, srcdir, **config):
+        values = {
+            'source_suffix': {'.rst': 'restructuredtext'},
+            'templates_path': [],
+        }
+
+        recorder = SimpleNamespace(
+            setup_extension=lambda name: None,
+            add_config_value=lambda name, default, rebuild: values.update(
+                {name: default}
+            ),
+            connect=lambda event, callback: None,
+            add_event=lambda name: None,
+        )
+        autoapi_sphinx.setup(recorder)
+        values.update(config)
+
+        self.confdir = srcdir
+        self.config = SimpleNamespace(**values)
+        self.env = SimpleNamespace(srcdir=srcdir)
+        self.builder = SimpleNamespace(
+            config=self.config,
+            confdir=Path(srcdir),
+            _translator=None,
+        )
+
+
+def unload(name):
+    """
+    Remove a package and all its submodules from the imported modules.
+    """
+    for key in list(sys.modules):
+        if key == name or key.startswith(name + '.'):
+            del sys.modules[key]
+    invalidate_caches()
+
+
+def measure(function, repeat, setup=None):
+    """
+    Time a function.
+
+    :param function: Function to time.
+    :param int repeat: Number of runs.
+    :param setup: Function to call before each run, not timed.
+
+    :rtype: dict
+    :return: Minimum, mean and maximum time in seconds, and all runs.
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        function()
+        runs.append(perf_counter() - start)
+
+    return {
+        'min': min(runs),
+        'mean': sum(runs) / len(runs),
+        'max': max(runs),
+        'runs': runs,
+    }
+
+
+def benchmark(workdir, repeat, breadth, depth, modules, names):
+    """
+    Run all benchmarks on a synthetic package.
+
+    :rtype: dict
+    :return: The benchmark report.
+    """
+    total = generate(
+        workdir, PACKAGE,
+        breadth=breadth, depth=depth, modules=modules, names=names,
+    )
+    sys.path.insert(0, workdir)
+
+    results = {}
+
+    def reset():
+        unload(PACKAGE)
+
+    results['construction'] = measure(
+        lambda: APINode(PACKAGE), repeat, setup=reset
+    )
+    results['construction_static'] = measure(
+        lambda: APINode(PACKAGE, static=True), repeat, setup=reset
+    )
+
+    # Otherwise the static construction also times the imports
+    reset()
+    static = APINode(PACKAGE, static=True)
+    assert all(node.module is None for node in static.directory.values()), \
+        'Static discovery imported modules of the synthetic package'
+
+    tree = APINode(PACKAGE)
+    nodes = list(tree.directory.values())
+
+    def walk():
+        for node, leaves in tree.walk():
+            pass
+
+    def unmark():
+        for node in nodes:
+            node._relevant = None
+
+    results['walk'] = measure(walk, repeat)
+    results['tree'] = measure(tree.tree, repeat)
+    results['is_relevant'] = measure(tree.is_relevant, repeat, setup=unmark)
+
+    srcdir = join(workdir, 'docs')
+    app = StubApp(srcdir, autoapi_modules={PACKAGE: None})
+
+    def clean():
+        rmtree(join(srcdir, PACKAGE), ignore_errors=True)
+        reset()
+
+    results['render'] = measure(
+        lambda: autoapi_sphinx.builder_inited(app), repeat, setup=clean
+    )
+
+    parallel = StubApp(srcdir, autoapi_modules={PACKAGE: {'jobs': 4}})
+    results['render_jobs'] = measure(
+        lambda: autoapi_sphinx.builder_inited(parallel), repeat, setup=clean
+    )
+
+    return {
+        'autoapi': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'breadth': breadth,
+            'depth': depth,
+            'modules': modules,
+            'names': names,
+            'repeat': repeat,
+        },
+        'total_modules': total,
+        'results': results,
+    }
+
+
+def compare(report, previous, threshold):
+    """
+    Compare a report against a previous one.
+
+    :param dict report: Current report.
+    :param dict previous: Previous report.
+    :param float threshold: Maximum allowed ratio between the current and
+     previous minimum times.
+
+    :rtype: list
+    :return: Names of the benchmarks that regressed.
+    """
+    regressions = []
+    for name, result in sorted(report['results'].items()):
+        if name not in previous['results']:
+            continue
+        ratio = result['min'] / previous['results'][name]['min']
+        print('{:<20} {:>10.4f}s {:>10.4f}s {:>7.2f}x'.format(
+            name, previous['results'][name]['min'], result['min'], ratio
+        ))
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark AutoAPI.')
+    parser.add_argument('--breadth', type=int, default=4)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--modules', type=int, default=10)
+    parser.add_argument('--names', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', default=None)
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args()
+
+    workdir = mkdtemp(prefix='autoapi-benchmark-')
+    try:
+        report = benchmark(
+            workdir, args.repeat,
+            args.breadth, args.depth, args.modules, args.names,
+        )
+    finally:
+        rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w') as fd:
+        json.dump(report, fd, indent=4, sort_keys=True)
+
+    for name, result in sorted(report['results'].items()):
+        print('{:<20} {:>10.4f}s'.format(name, result['min']))
+
+    if args.compare:
+        with open(args.compare) as fd:
+            previous = json.load(fd)
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            print('Regressions: {}'.format(', '.join(regressions)))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Generator of synthetic Python packages to benchmark AutoAPI.
+
+The generated package is a tree of subpackages where each package has
+``breadth`` subpackages, up to ``depth`` levels, and ``modules`` submodules.
+Each module, including the package entry points, lists ``names`` public
+objects in its ``__all__``, evenly distributed between functions, classes,
+exceptions and variables.
+"""
+
+from os import makedirs
+from os.path import join
+
+
+FUNCTION = '''
+def function_{index}(argument):
+    """
+    Function {index} summary.
+
+    :param argument: Some argument.
+    """
+    return argument
+'''
+
+CLASS = '''
+class Class{index}(object):
+    """
+    Class {index} summary.
+    """
+
+    def method(self):
+        """
+        Method summary.
+        """
+'''
+
+EXCEPTION = '''
+class Exception{index}(Exception):
+    """
+    Exception {index} summary.
+    """
+'''
+
+VARIABLE = '''
+VARIABLE_{index} = {{
+    'index': {index},
+    'values': [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+}}
+'''
+
+KINDS = [
+    (FUNCTION, 'function_{}'),
+    (CLASS, 'Class{}'),
+    (EXCEPTION, 'Exception{}'),
+    (VARIABLE, 'VARIABLE_{}'),
+]
+
+
+def module_source(names):
+    """
+    Generate the source code of a module.
+
+    :param int names: Number of public objects in the module.
+
+    :rtype: str
+    :return: The source code of the module.
+    """
+    source = ['"""\nSynthetic module.\n"""\n']
+    public = []
+
+    for index in range(names):
+        template, name = KINDS[index % len(KINDS)]
+        source.append(template.format(index=index))
+        public.append(name.format(index))
+
+    source.append('\n__all__ = {!r}\n'.format(public))
+    return ''.join(source)
+
+
+def generate(directory, name, breadth=4, depth=3, modules=10, names=8):
+    """
+    Generate a synthetic package.
+
+    :param str directory: Directory where to create the package.
+    :param str name: Name of the root package.
+    :param int breadth: Number of subpackages of each package.
+    :param int depth: Number of levels of subpackages.
+    :param int modules: Number of submodules of each package.
+    :param int names: Number of public objects of each module.
+
+    :rtype: int
+    :return: The total number of modules generated, including packages.
+    """
+    source = module_source(names)
+    total = 0
+    pending = [(join(directory, name), 1)]
+
+    while pending:
+        path, level = pending.pop()
+        makedirs(path, exist_ok=True)
+
+        with open(join(path, '__init__.py'), 'w') as fd:
+            fd.write(source)
+        total += 1
+
+        for index in range(modules):
+            with open(join(path, 'module{}.py'.format(index)), 'w') as fd:
+                fd.write(source)
+            total += 1
+
+        if level < depth:
+            for index in range(breadth):
+                pending.append(
+                    (join(path, 'package{}'.format(index)), level + 1)
+                )
+
+    return total
+
+
+__all__ = ['generate', 'module_source']
@@ -29,9 +29,12 @@ from autoapi.apinode import APINode
 if __name__ == '__main__':
 
     basicConfig(level=DEBUG)
-    m = APINode('sphinx')
 
-    for node, leaves in m.walk():
+    # Only the branch leading to sphinx.ext and its subtree are inspected
+    m = APINode('sphinx', lazy=True)
+    ext = m.get_module('sphinx.ext')
+
+    for node, leaves in ext.walk():
         print(
             '{} node has leaves: {}'.format(
                 node.name, ', '.join([l.name for l in leaves])
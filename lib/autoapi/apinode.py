@@ -71,17 +71,222 @@ Being Variables the default if it cannot be determined that an element belongs
 to any of other categories.
 """
 
+import sys
+from itertools import repeat
 from logging import getLogger
 from pkgutil import iter_modules
 from traceback import format_exc
 from importlib import import_module
+from types import MappingProxyType
 from collections import OrderedDict
+from contextlib import contextmanager
 from inspect import isclass, isfunction
 
+from .filters import ModuleFilter
+from .directory import Directory
+from .profiling import Profiler, measure
+from .workers import WorkerError, WorkerPool
+from .static import CATEGORIES, StaticAnalyzer, StaticObject, find_spec
+
 
 log = getLogger(__name__)
 
 
+# Read-only empty containers shared by the nodes without public API
+_EMPTY_CATEGORY = MappingProxyType(OrderedDict())
+_EMPTY_API = MappingProxyType(OrderedDict(
+    (category, _EMPTY_CATEGORY) for category in CATEGORIES.values()
+))
+
+
+def fetch_public(module):
+    """
+    Fetch and categorize all public objects listed in a loaded module.
+
+    The objects are listed in the ``__api__`` or the ``__all__`` variables of
+    the module, with ``__api__`` having the precedence.
+
+    :param module: The loaded module.
+
+    :rtype: :py:class:`OrderedDict`
+    :return: An ordered mapping between the public names and a tuple
+     ``(category, object)``. See :meth:`APINode.categorize`.
+    """
+    public = OrderedDict()
+    for public_key in ['__api__', '__all__']:
+        if not hasattr(module, public_key):
+            continue
+
+        for obj_name in getattr(module, public_key):
+            if not hasattr(module, obj_name):
+                log.warning(
+                    'Module {} doesn\'t have a element {}'.format(
+                        module.__name__, obj_name
+                    )
+                )
+                continue
+            obj = getattr(module, obj_name)
+            public[obj_name] = (APINode.categorize(obj), obj)
+        break
+    return public
+
+
+def _discover(name, selected=None):
+    """
+    Iterate top-down the names and specifications of a module and all its
+    submodules without importing them.
+
+    Submodules not accepted by the ``selected`` predicate, if any, are skipped
+    together with their own submodules.
+    """
+    spec = find_spec(name)
+    yield name, spec
+
+    if spec is None or spec.submodule_search_locations is None:
+        return
+
+    for _, subname, ispkg in iter_modules(
+            spec.submodule_search_locations, name + '.'):
+        if selected is not None and not selected(subname):
+            log.info('Skipping {}'.format(subname))
+            continue
+        for found in _discover(subname, selected):
+            yield found
+
+
+@contextmanager
+def _restoring(enabled):
+    """
+    Context manager that removes from :py:data:`sys.modules` the modules
+    imported in its block, if enabled.
+
+    Importing a submodule also binds it as an attribute of its package, so the
+    removed modules are unbound from the packages that stay imported too, or
+    those would keep them alive.
+    """
+    if not enabled:
+        yield
+        return
+
+    modules = set(sys.modules)
+    try:
+        yield
+    finally:
+        removed = [
+            (name, sys.modules.pop(name))
+            for name in list(sys.modules) if name not in modules
+        ]
+        for name, module in removed:
+            parent, _, attribute = name.rpartition('.')
+            package = sys.modules.get(parent)
+            if package is not None and \
+                    getattr(package, attribute, None) is module:
+                delattr(package, attribute)
+
+
+def _initialize_worker(path):
+    """
+    Initialize a worker process with the import path of the parent process.
+    """
+    sys.path[:] = path
+
+
+def _summarize(name, static, profile=None):
+    """
+    Inspect a single module. Executed in the worker processes.
+
+    :param str name: Name of the module.
+    :param bool static: Analyze the source of the module.
+    :param bool profile: If not None, profile the inspection, recording also
+     the memory if True.
+
+    :return: A picklable dictionary with the name of the module and either its
+     public API or the error that prevented the module to be inspected. If
+     profiled, the records of the module are included in the ``profile`` key.
+    """
+    profiler = None
+    if profile is not None:
+        profiler = Profiler(memory=profile)
+
+    try:
+        analyzer = StaticAnalyzer()
+        with measure(profiler, name, 'import'):
+            public = None
+            module = None
+            if static:
+                public = analyzer.analyze(name)
+            if public is None:
+                module = import_module(name)
+
+        with measure(profiler, name, 'extract'):
+            # The modules defining the objects found statically are known,
+            # while imported variables have no reference to their origin
+            followed = list(public or ())
+            if public is None:
+                public = fetch_public(module)
+                followed = [
+                    obj_name for obj_name, (category, obj) in public.items()
+                    if category == 'variables'
+                ]
+
+            api = OrderedDict(
+                (category, []) for category in CATEGORIES.values()
+            )
+            for obj_name, (category, obj) in public.items():
+                if not isinstance(obj, StaticObject):
+                    obj = StaticObject.from_object(obj_name, obj, category)
+                api[category].append((obj_name, obj))
+
+        summary = {
+            'name': name,
+            'api': api,
+            'dependencies': sorted(analyzer.dependencies(name, followed)),
+        }
+
+    except Exception:
+        summary = {'name': name, 'error': format_exc()}
+
+    if profiler is not None:
+        profiler.stop()
+        summary['profile'] = profiler.records.get(name, {})
+    return summary
+
+
+class NodeSummary(object):
+    """
+    Summary of a released node, kept by :meth:`APINode.stream` to list the
+    submodules of its parent.
+
+    :param str name: Name of the module.
+    :param bool relevant: If the branch of the module is relevant. See
+     :meth:`APINode.is_relevant`.
+
+    **Attributes:**
+
+    :var name: Name of the module.
+    :var subname: Last part of the name of the module.
+    """
+
+    __slots__ = ('name', 'subname', '_relevant')
+
+    def __init__(self, name, relevant):
+        self.name = name
+        self.subname = name.rpartition('.')[2]
+        self._relevant = relevant
+
+    def is_relevant(self):
+        """
+        Check if the branch of the module is relevant.
+
+        :rtype: bool
+        :return: True if the module is relevant.
+        """
+        return self._relevant
+
+    def __repr__(self):
+        return self.name
+
+
 class APINode(object):
     """
     Tree node class for module instrospection.
@@ -91,21 +296,56 @@ class APINode(object):
     :param dict directory: Directory to store the index of all the modules.
      If None, the default, the root node will create one a pass it to the
      subnodes.
+    :param bool static: If True, discover the public API of the modules by
+     analyzing their source code instead of importing them. Modules whose
+     public API cannot be determined statically are imported anyway. See
+     :mod:`autoapi.static`.
+    :param bool lazy: If True, the subnodes and the public API categories of
+     each node are built the first time they are accessed, instead of
+     eagerly building the whole tree. :meth:`walk`, :meth:`tree` and
+     :meth:`is_relevant` only expand the tree as far as they need to, and
+     :meth:`get_module` only the branch leading to the module. Accessing the
+     ``directory`` expands the whole tree.
+    :param profiler: Profiler to record the time spent on each node. See
+     :class:`autoapi.profiling.Profiler`.
+    :param list include: Patterns of the submodules to include in the tree.
+     If None, the default, all submodules are included.
+    :param list exclude: Patterns of the submodules to exclude from the tree.
+    :param int max_depth: Maximum number of levels of submodules to include
+     below the root node. If None, the default, there is no limit.
+    :param bool light: If True, once the public API of each node is extracted,
+     the public objects are replaced by :class:`autoapi.static.StaticObject`
+     records with only what is needed to render them (names, kind, summary,
+     bases and a bounded representation of the value) and the reference to
+     the module is dropped, so the modules and objects are not kept alive by
+     the tree.
+
+    Submodules that don't pass the ``include``, ``exclude`` and ``max_depth``
+    selection are skipped, with all their submodules, before being imported.
+    See :mod:`autoapi.filters` for the syntax of the patterns.
 
     **Attributes:**
 
     :var name: Name of the current module.
     :var subname: Last part of the name of this module. For example if name is
      ``my.module.another`` the subname will be ``another``.
-    :var directory: Directory of the tree. This is a :py:class:`OrderedDict`
-     that will register all modules name with it's associated node
+    :var parent: The parent :class:`APINode` of this node. None for the root
+     node.
+    :var directory: Directory of the tree. This is a
+     :class:`autoapi.directory.Directory`, an :py:class:`OrderedDict` that
+     will register all modules name with it's associated node
      :class:`APINode`. All nodes of a tree share this index and thus
-     the whole tree can be queried from any node.
-    :var module: The loaded module.
+     the whole tree can be queried from any node, including the descendants,
+     ancestors and size of the subtree of any module.
+    :var module: The loaded module. None if the module public API was
+     discovered statically.
     :var subnodes: A list of :class:`APINode` with all child submodules
-     and subpackages.
+     and subpackages. An empty tuple for leaf nodes.
     :var subnodes_failed: A list of submodules and subpackages names that
-     failed to import.
+     failed to import. An empty tuple if none failed.
+    :var failures: A :py:class:`OrderedDict` mapping the names in
+     ``subnodes_failed`` with the reason of the failure, usually the
+     traceback of the error.
 
     **Public API categories:**
 
@@ -119,85 +359,866 @@ class APINode(object):
      the public API of the module.
 
     In all categories the order on which the elements are listed is preserved.
+    Empty categories are read-only mappings shared by all nodes.
     """
 
-    def __init__(self, name, directory=None):
-        self.module = import_module(name)
+    __slots__ = (
+        'module', 'name', 'subname', 'parent',
+        '_depth', '_is_root', '_directory', '_api',
+        '_subnodes', '_subnodes_failed', '_failures', '_relevant',
+        '_static', '_lazy', '_public', '_expanded', '_loaded', '_complete',
+        '_profiler', '_filter', '_exporters', '_objects', '_light',
+    )
+
+    def __init__(
+            self, name, directory=None, static=False, lazy=False,
+            profiler=None, include=None, exclude=None, max_depth=None,
+            light=False):
+
+        # Analyze the source or load the module
+        module, public = self._inspect(name, static, profiler)
+
+        # Now that the module was imported register itself in the directory
+        self._setup(name, directory, module)
+        self._static = static
+        self._lazy = lazy
+        self._public = public
+        self._profiler = profiler
+        self._light = light
+        if self._is_root:
+            self._filter = ModuleFilter.create(
+                name, include=include, exclude=exclude, max_depth=max_depth,
+            )
+
+        if lazy:
+            return
+
+        self._expand()
+        self._load()
+
+        # Flag to mark if this branch is relevant
+        # For self._relevant, None means undertermined
+        if self.is_root():
+            self._complete = True
+            self.is_relevant()
+
+    @staticmethod
+    def _inspect(name, static, profiler):
+        """
+        Analyze the source of a module, or import it.
+
+        :return: A tuple ``(module, public)`` with the loaded module, or None
+         if analyzed statically, and the public objects found statically, or
+         None if imported.
+        """
+        with measure(profiler, name, 'import'):
+            public = None
+            if static:
+                public = StaticAnalyzer().analyze(name)
+            module = None
+            if public is None:
+                module = import_module(name)
+        return module, public
+
+    def _setup(self, name, directory, module, parent=None):
+        """
+        Initialize the node attributes and register it in the directory.
+        """
+        self.module = module
         self.name = name
-        self.subname = name.split('.')[-1]
-
-        self.functions = OrderedDict()
-        self.classes = OrderedDict()
-        self.exceptions = OrderedDict()
-        self.variables = OrderedDict()
-        self.api = OrderedDict((
-            ('functions', self.functions),
-            ('classes', self.classes),
-            ('exceptions', self.exceptions),
-            ('variables', self.variables),
-        ))
-
-        self.subnodes = []
-        self.subnodes_failed = []
-
-        self.directory = OrderedDict()
-        if directory is not None:
-            self.directory = directory
+        self.subname = name.rpartition('.')[2]
+        self.parent = parent
+        self._depth = name.count('.') + 1
 
+        self._api = _EMPTY_API
+        self._subnodes = []
+        self._subnodes_failed = []
+        self._failures = OrderedDict()
+
+        self._directory = Directory()
+        if directory is not None:
+            self._directory = directory
+        self._is_root = not self._directory
+
+        self._static = False
+        self._lazy = False
+        self._public = None
+        self._profiler = None
+        self._filter = None
+        self._exporters = None
+        self._objects = None
+        self._light = False
         self._relevant = None
+        self._expanded = False
+        self._loaded = False
+        self._complete = False
+
+        # Now that all node public attributes exists register itself in the
+        # directory
+        self._directory[self.name] = self
 
-        # Now that all node public attributes exists and module was imported
-        # register itself in the directory
-        self.directory[self.name] = self
+    def _expand(self):
+        """
+        Create the subnodes of this node.
+        """
+        self._expanded = True
 
         # Check if package and iterate over subnodes
-        if hasattr(self.module, '__path__'):
-            for _, subname, ispkg in iter_modules(
-                    self.module.__path__, self.module.__name__ + '.'):
-                log.info('Recursing into {}'.format(subname))
+        if self.module is not None:
+            path = getattr(self.module, '__path__', None)
+        else:
+            path = find_spec(self.name).submodule_search_locations
 
-                try:
-                    subnode = APINode(subname, self.directory)
-                    self.subnodes.append(subnode)
-                except Exception:
-                    log.error('Failed to import {}'.format(subname))
-                    log.error(format_exc())
-                    self.subnodes_failed.append(subname)
+        if path is None:
+            self._compact()
+            return
+
+        selected = self._root()._filter
 
-        # Fetch all public objects
-        public = OrderedDict()
-        for public_key in ['__api__', '__all__']:
-            if not hasattr(self.module, public_key):
+        for _, subname, ispkg in iter_modules(path, self.name + '.'):
+            if selected is not None and not selected(subname):
+                log.info('Skipping {}'.format(subname))
                 continue
 
-            for obj_name in getattr(self.module, public_key):
-                if not hasattr(self.module, obj_name):
-                    log.warning(
-                        'Module {} doesn\'t have a element {}'.format(
-                            self.name, obj_name
+            log.info('Recursing into {}'.format(subname))
+
+            try:
+                subnode = APINode(
+                    subname, self._directory,
+                    static=self._static, lazy=self._lazy,
+                    profiler=self._profiler, light=self._light,
+                )
+                subnode.parent = self
+                self._subnodes.append(subnode)
+            except Exception:
+                log.error('Failed to import {}'.format(subname))
+                log.error(format_exc())
+                self._subnodes_failed.append(subname)
+                self._failures[subname] = format_exc()
+
+        self._compact()
+
+    def _load(self):
+        """
+        Fetch and categorize the public objects of this node.
+        """
+        self._loaded = True
+
+        with measure(self._profiler, self.name, 'extract'):
+            # Fetch all public objects
+            public = self._public
+            self._public = None
+            if public is None:
+                public = fetch_public(self.module)
+
+            # Categorize objects
+            self._categorize(
+                (obj_name, category, obj)
+                for obj_name, (category, obj) in public.items()
+            )
+
+            if self._light:
+                self._release()
+
+    def _release(self):
+        """
+        Replace the public objects with lightweight records and drop the
+        reference to the module.
+        """
+        self.module = None
+
+        for category, elements in self._api.items():
+            for obj_name, obj in list(elements.items()):
+                if not isinstance(obj, StaticObject):
+                    obj = StaticObject.from_object(obj_name, obj, category)
+                    elements[obj_name] = obj
+
+                # Only the summary of the docstring is rendered
+                obj.__doc__ = None
+
+    def _categorize(self, public):
+        """
+        Store the public objects of this node in their categories.
+
+        Nodes without public API, and the empty categories of nodes with
+        public API, share read-only empty containers.
+
+        :param public: An iterable of tuples ``(name, category, object)``.
+        """
+        api = None
+        for obj_name, category, obj in public:
+            if api is None:
+                api = OrderedDict(
+                    (key, OrderedDict()) for key in CATEGORIES.values()
+                )
+            api[category][obj_name] = obj
+
+        if api is None:
+            self._api = _EMPTY_API
+            return
+
+        for category, elements in api.items():
+            if not elements:
+                api[category] = _EMPTY_CATEGORY
+        self._api = api
+
+    def _compact(self):
+        """
+        Replace empty lists of subnodes with shared empty containers.
+        """
+        if not self._subnodes:
+            self._subnodes = ()
+        if not self._subnodes_failed:
+            self._subnodes_failed = ()
+            self._failures = _EMPTY_CATEGORY
+
+    def _root(self):
+        """
+        Get the root node of the tree.
+        """
+        for node in self._directory.values():
+            return node
+        raise Exception('Empty directory!')
+
+    def preorder(self):
+        """
+        Iterate top-down all the nodes of the subtree at the current node.
+
+        For the root node, the nodes are listed in the same order of the
+        directory.
+
+        :return: This method will yield each :class:`APINode` in the subtree,
+         starting by the current node.
+        """
+        yield self
+        for subnode in self.subnodes:
+            for node in subnode.preorder():
+                yield node
+
+    @property
+    def directory(self):
+        root = self._root()
+
+        # Lazy trees must be completely expanded to list all modules
+        if not root._complete:
+            for node in root.preorder():
+                self._directory.move_to_end(node.name)
+            root._complete = True
+
+        return self._directory
+
+    @property
+    def subnodes(self):
+        if not self._expanded:
+            self._expand()
+        return self._subnodes
+
+    @property
+    def subnodes_failed(self):
+        if not self._expanded:
+            self._expand()
+        return self._subnodes_failed
+
+    @property
+    def failures(self):
+        if not self._expanded:
+            self._expand()
+        return self._failures
+
+    @property
+    def api(self):
+        if not self._loaded:
+            self._load()
+        return self._api
+
+    @property
+    def functions(self):
+        return self.api['functions']
+
+    @property
+    def classes(self):
+        return self.api['classes']
+
+    @property
+    def exceptions(self):
+        return self.api['exceptions']
+
+    @property
+    def variables(self):
+        return self.api['variables']
+
+    @classmethod
+    def build(
+            cls, name, jobs=None, static=False, cache=None, profiler=None,
+            timeout=None, include=None, exclude=None, max_depth=None,
+            light=False, restore=False):
+        """
+        Build a tree, optionally inspecting the modules in parallel or loading
+        them from a cache.
+
+        With ``jobs`` greater than one or a ``cache``, the modules of the
+        package are discovered from the file system without importing them.
+        Each module is then inspected separately, in a pool of worker
+        processes if ``jobs`` is greater than one, producing a summary of the
+        module where the public objects are replaced by picklable
+        :class:`autoapi.static.StaticObject`. The summaries are finally merged
+        into the same tree structure built by the constructor.
+
+        When a ``timeout`` is given, the modules are always inspected in
+        worker processes, even with a single job. A module that takes longer
+        than the timeout to inspect, or that crashes or exits its worker
+        process, is reported as failed with the reason in the ``failures`` of
+        its parent, and its worker process is replaced.
+
+        When a cache is given, the summaries of the modules that didn't change
+        since the last build are loaded from it and only the remaining modules
+        are inspected.
+
+        Nodes built this way have no ``module``.
+
+        :param str name: Name of the module to build the tree from.
+        :param int jobs: Number of worker processes to use. If None or one,
+         the default, the modules are inspected in the current process.
+        :param bool static: Analyze the source of the modules instead of
+         importing them. See :class:`APINode`.
+        :param cache: Cache to load and store the summaries of the modules.
+         See :class:`autoapi.cache.APICache`.
+        :param profiler: Profiler to record the time spent on each module.
+         See :class:`autoapi.profiling.Profiler`.
+        :param float timeout: Maximum time in seconds to inspect each module.
+         If None, the default, modules can take any time.
+        :param list include: Patterns of the submodules to include. See
+         :class:`APINode`.
+        :param list exclude: Patterns of the submodules to exclude. See
+         :class:`APINode`.
+        :param int max_depth: Maximum number of levels of submodules. See
+         :class:`APINode`.
+        :param bool light: Keep only lightweight records of the public
+         objects. See :class:`APINode`.
+        :param bool restore: Remove from :py:data:`sys.modules` all the
+         modules imported while building the tree, so they can be released
+         once the tree is built with ``light``.
+
+        :rtype: :class:`APINode`
+        :return: The root node of the tree.
+        """
+        with _restoring(restore):
+            isolated = timeout is not None
+            parallel = jobs is not None and jobs > 1
+            if not parallel and not isolated and cache is None:
+                return cls(
+                    name, static=static, profiler=profiler,
+                    include=include, exclude=exclude, max_depth=max_depth,
+                    light=light,
+                )
+
+            profile = None
+            if profiler is not None:
+                profile = profiler.memory
+
+            selected = ModuleFilter.create(
+                name, include=include, exclude=exclude, max_depth=max_depth,
+            )
+            specs = OrderedDict(_discover(name, selected))
+            summaries = OrderedDict((subname, None) for subname in specs)
+
+            # Load unchanged modules from the cache
+            keys = {}
+            if cache is not None:
+                for subname, spec in specs.items():
+                    keys[subname] = cache.key(spec, static)
+                    summaries[subname] = cache.get(subname, keys[subname])
+
+            # Inspect the remaining modules
+            stale = [
+                subname for subname, summary in summaries.items()
+                if summary is None
+            ]
+
+            if isolated or (parallel and len(stale) > 1):
+                with WorkerPool(
+                        jobs or 1, timeout=timeout,
+                        initializer=_initialize_worker,
+                        initargs=(list(sys.path),)) as pool:
+
+                    inspected = [
+                        {'name': subname, 'error': summary.reason}
+                        if isinstance(summary, WorkerError) else summary
+                        for subname, summary in zip(stale, pool.map(
+                            _summarize, stale, repeat(static), repeat(profile),
+                        ))
+                    ]
+            else:
+                inspected = [
+                    _summarize(subname, static, profile) for subname in stale
+                ]
+
+            for summary in inspected:
+                records = summary.pop('profile', {})
+                for phase, record in records.items():
+                    profiler.record(
+                        summary['name'], phase,
+                        record['time'], record['memory'],
+                    )
+
+                summaries[summary['name']] = summary
+                if cache is not None and 'error' not in summary:
+                    cache.set(summary['name'], keys[summary['name']], summary)
+
+            root = cls._merge(
+                summaries.values(), static=static, profiler=profiler,
+            )
+            root._filter = selected
+            if light:
+                for node in root._directory.values():
+                    node._light = True
+                    node._release()
+            root.is_relevant()
+            return root
+
+    @classmethod
+    def _merge(cls, summaries, static=False, profiler=None):
+        """
+        Build a tree from the summaries of its modules, given top-down.
+
+        :return: The root node of the tree.
+        """
+        root = None
+        failed = set()
+
+        for summary in summaries:
+            name = summary['name']
+            parent = name.rpartition('.')[0]
+
+            # Subtrees of failed packages are ignored
+            if parent in failed:
+                failed.add(name)
+                continue
+
+            if 'error' in summary:
+                if root is None:
+                    raise ImportError(
+                        'Failed to import {}:\n{}'.format(
+                            name, summary['error']
                         )
                     )
-                    continue
-                public[obj_name] = getattr(self.module, obj_name)
-            break
-
-        # Categorize objects
-        for obj_name, obj in public.items():
-            if isclass(obj):
-                if issubclass(obj, Exception):
-                    self.exceptions[obj_name] = obj
-                    continue
-                self.classes[obj_name] = obj
+                log.error('Failed to import {}'.format(name))
+                log.error(summary['error'])
+                root._directory[parent]._subnodes_failed.append(name)
+                root._directory[parent]._failures[name] = summary['error']
+                failed.add(name)
                 continue
-            if isfunction(obj):
-                self.functions[obj_name] = obj
+
+            if root is not None:
+                log.info('Recursing into {}'.format(name))
+
+            node = cls.__new__(cls)
+            if root is None:
+                node._setup(name, None, None)
+                root = node
+                root._complete = True
+            else:
+                parent = root._directory[parent]
+                node._setup(name, root._directory, None, parent)
+                parent._subnodes.append(node)
+
+            node._expanded = True
+            node._loaded = True
+            node._static = static
+            node._profiler = profiler
+            node._categorize(
+                (obj_name, category, obj)
+                for category, elements in summary['api'].items()
+                for obj_name, obj in elements
+            )
+
+        for node in root._directory.values():
+            node._compact()
+        return root
+
+    @classmethod
+    def stream(
+            cls, name, static=False, profiler=None,
+            include=None, exclude=None, max_depth=None, restore=False):
+        """
+        Iterate bottom-up the nodes of a module and all its submodules, while
+        they are discovered.
+
+        Unlike the constructor, the whole tree is never held in memory. Each
+        node is built as a light node (see :class:`APINode`) and is yielded
+        right after all its submodules, so its relevance is known. Once
+        yielded, the node is released, and only a :class:`NodeSummary` of it
+        is kept by its parent until the parent is yielded in turn.
+
+        The nodes yielded are detached: they have no parent, their directory
+        only contains themselves, and their ``subnodes`` are the
+        :class:`NodeSummary` of their submodules.
+
+        :param str name: Name of the module to stream the tree from.
+        :param bool static: Analyze the source of the modules instead of
+         importing them. See :class:`APINode`.
+        :param profiler: Profiler to record the time spent on each module.
+         See :class:`autoapi.profiling.Profiler`.
+        :param list include: Patterns of the submodules to include. See
+         :class:`APINode`.
+        :param list exclude: Patterns of the submodules to exclude. See
+         :class:`APINode`.
+        :param int max_depth: Maximum number of levels of submodules. See
+         :class:`APINode`.
+        :param bool restore: Remove from :py:data:`sys.modules` the modules
+         imported to inspect each submodule, as soon as the submodule and all
+         its own submodules were yielded. Otherwise, the modules stay
+         imported, and the memory used grows with the size of the package.
+
+        :return: An iterator of :class:`APINode`, in post-order.
+        """
+        selected = ModuleFilter.create(
+            name, include=include, exclude=exclude, max_depth=max_depth,
+        )
+        with _restoring(restore):
+            inspected = cls._inspect(name, static, profiler)
+            yield from cls._stream(
+                name, inspected, static, profiler, selected, restore,
+            )
+
+    @classmethod
+    def _stream(cls, name, inspected, static, profiler, selected, restore):
+        """
+        Build a detached light node, yielding first the nodes of all its
+        submodules.
+        """
+        module, public = inspected
+
+        node = cls.__new__(cls)
+        node._setup(name, None, module)
+        node._static = static
+        node._public = public
+        node._profiler = profiler
+        node._light = True
+        node._complete = True
+
+        # Find the submodules before the module is released
+        if module is not None:
+            path = getattr(module, '__path__', None)
+        else:
+            path = find_spec(name).submodule_search_locations
+        del module, public, inspected
+        node._load()
+
+        for _, subname, ispkg in iter_modules(path or [], name + '.'):
+            if selected is not None and not selected(subname):
+                log.info('Skipping {}'.format(subname))
                 continue
-            self.variables[obj_name] = obj
 
-        # Flag to mark if this branch is relevant
-        # For self._relevant, None means undertermined
-        if self.is_root():
-            self.is_relevant()
+            log.info('Recursing into {}'.format(subname))
+
+            with _restoring(restore):
+                try:
+                    subinspected = cls._inspect(subname, static, profiler)
+                except Exception:
+                    log.error('Failed to import {}'.format(subname))
+                    log.error(format_exc())
+                    node._subnodes_failed.append(subname)
+                    node._failures[subname] = format_exc()
+                    continue
+
+                # The last node yielded is the one of the submodule
+                for subnode in cls._stream(
+                        subname, subinspected, static, profiler, selected,
+                        restore):
+                    yield subnode
+                del subinspected
+
+            node._subnodes.append(
+                NodeSummary(subnode.name, subnode.is_relevant())
+            )
+            del subnode
+
+        node._expanded = True
+        node._compact()
+        node.is_relevant()
+        yield node
+
+    def detached(self):
+        """
+        Get a copy of this node that can be sent to another process.
+
+        The copy has no parent nor module, its directory only contains
+        itself, and its ``subnodes`` are the :class:`NodeSummary` of the
+        subnodes of this node. The public objects are the same of this node,
+        so they must be picklable, like :class:`autoapi.static.StaticObject`.
+
+        :rtype: :class:`APINode`
+        :return: The detached copy of this node.
+        """
+        node = APINode.__new__(APINode)
+        node._setup(self.name, None, None)
+        node._static = self._static
+        node._light = self._light
+        node._api = OrderedDict(
+            (category, OrderedDict(elements))
+            for category, elements in self.api.items()
+        )
+        node._subnodes = [
+            NodeSummary(subnode.name, subnode.is_relevant())
+            for subnode in self.subnodes
+        ]
+        node._subnodes_failed = list(self.subnodes_failed)
+        node._failures = OrderedDict(self.failures)
+        node._relevant = self.is_relevant()
+        node._expanded = True
+        node._loaded = True
+        node._complete = True
+        return node
+
+    @staticmethod
+    def categorize(obj):
+        """
+        Determine the public API category of an object.
+
+        :param obj: The object to categorize.
+
+        :rtype: str
+        :return: The name of the category, one of ``functions``, ``classes``,
+         ``exceptions`` or ``variables``.
+        """
+        if isclass(obj):
+            if issubclass(obj, Exception):
+                return 'exceptions'
+            return 'classes'
+        if isfunction(obj):
+            return 'functions'
+        return 'variables'
+
+    def sources(self):
+        """
+        Get the modules defining the public functions, classes and exceptions
+        of this node, as reported by their ``__module__``.
+
+        As variables don't know their module, they are found by following the
+        imports in the source of this node, like in the static analysis. The
+        variables that can't be found this way are considered defined in the
+        module exporting them.
+
+        :rtype: :py:class:`OrderedDict`
+        :return: A mapping between the public names and the name of the module
+         defining them, or None if unknown.
+        """
+        origins = {}
+        if self.variables:
+            origins = StaticAnalyzer().origins(self.name, self.variables)
+
+        sources = OrderedDict()
+        for category, elements in self.api.items():
+            for obj_name, obj in elements.items():
+                if category == 'variables':
+                    module = origins.get(obj_name, self.name)
+                else:
+                    module = getattr(obj, '__module__', None)
+                sources[obj_name] = module
+        return sources
+
+    def dependencies(self):
+        """
+        Get the other modules this node exports objects from.
+
+        Besides the modules defining the public objects, this includes the
+        modules the imports of the variables go through and, for variables
+        computed from other objects, all the modules imported by the module
+        defining them. See
+        :meth:`autoapi.static.StaticAnalyzer.dependencies`.
+
+        :rtype: set
+        :return: The names of the modules the public objects of this node
+         depend on, other than the module of this node.
+        """
+        modules = set(self.sources().values())
+        if self.variables:
+            modules.update(
+                StaticAnalyzer().dependencies(self.name, self.variables)
+            )
+        modules.difference_update((None, self.name))
+        return modules
+
+    def exporters(self, name):
+        """
+        Get the nodes of the tree that export objects defined in a module.
+
+        The reverse index of the whole tree is built the first time it is
+        queried, and built again after a node is refreshed.
+
+        :param str name: Name of the module defining the objects.
+
+        :rtype: list
+        :return: The :class:`APINode` exporting objects of the module, other
+         than the node of the module itself, in the order of the directory.
+        """
+        root = self._root()
+        if root._exporters is None:
+            exporters = {}
+            for node in self.directory.values():
+                for module in node.dependencies():
+                    exporters.setdefault(module, []).append(node)
+            root._exporters = exporters
+        return list(root._exporters.get(name, ()))
+
+    def _index(self):
+        """
+        Get the inverted index of the public objects of the whole tree, built
+        the first time it is needed in a single pass over the directory.
+
+        :return: A tuple ``(names, qualnames, identities)`` of dictionaries
+         mapping the public names, the qualified names and the identity of
+         the objects to lists of tuples ``(node, category, name, object)``.
+        """
+        root = self._root()
+        if root._objects is None:
+            names = {}
+            qualnames = {}
+            identities = {}
+            for node in self.directory.values():
+                for category, elements in node.api.items():
+                    for obj_name, obj in elements.items():
+                        entry = (node, category, obj_name, obj)
+                        names.setdefault(obj_name, []).append(entry)
+                        identities.setdefault(id(obj), []).append(entry)
+
+                        qualname = node.qualname(obj_name, obj, category)
+                        if qualname is not None:
+                            qualnames.setdefault(qualname, []).append(entry)
+
+            root._objects = (names, qualnames, identities)
+        return root._objects
+
+    def qualname(self, obj_name, obj, category):
+        """
+        Get the fully qualified name of a public object of this node, from the
+        ``__module__`` and ``__qualname__`` of the object.
+
+        Variables are considered defined in this node, as each module
+        exporting a variable documents it.
+
+        :param str obj_name: Public name of the object.
+        :param obj: The object.
+        :param str category: Category of the object.
+
+        :rtype: str or None
+        :return: The qualified name, like ``package.module.Class``, or None
+         if the module defining the object is unknown.
+        """
+        if category == 'variables':
+            return '{}.{}'.format(self.name, obj_name)
+
+        module = getattr(obj, '__module__', None)
+        if module is None:
+            return None
+        return '{}.{}'.format(
+            module, getattr(obj, '__qualname__', None) or obj_name
+        )
+
+    def lookup_name(self, obj_name):
+        """
+        Get where the objects with a public name are exported in the tree.
+
+        The inverted index of the whole tree is built the first time it is
+        queried, and built again after a node is refreshed.
+
+        :param str obj_name: Public name of the objects.
+
+        :rtype: list
+        :return: A list of tuples ``(node, category)`` with the
+         :class:`APINode` exporting an object with that name and its category,
+         in the order of the directory.
+        """
+        return [
+            (node, category)
+            for node, category, _, _ in self._index()[0].get(obj_name, ())
+        ]
+
+    def lookup_qualname(self, qualname):
+        """
+        Get where an object is exported in the tree, by its qualified name.
+        See :meth:`qualname` and :meth:`lookup_name`.
+
+        :param str qualname: Fully qualified name of the object.
+
+        :rtype: list
+        :return: A list of tuples ``(node, category)``, in the order of the
+         directory.
+        """
+        return [
+            (node, category)
+            for node, category, _, _ in self._index()[1].get(qualname, ())
+        ]
+
+    def lookup_object(self, obj):
+        """
+        Get where an object is exported in the tree, by its identity. See
+        :meth:`lookup_name`.
+
+        Objects of trees built in worker processes or loaded from a cache or
+        an index are distinct records for each node exporting them, so they
+        should be looked up by :meth:`lookup_qualname` instead.
+
+        :param obj: The object.
+
+        :rtype: list
+        :return: A list of tuples ``(node, category)``, in the order of the
+         directory.
+        """
+        return [
+            (node, category)
+            for node, category, _, found in self._index()[2].get(id(obj), ())
+            if found is obj
+        ]
+
+    def definition(self, qualname):
+        """
+        Get the node of the module defining an object, if it exports it.
+
+        :param str qualname: Fully qualified name of the object.
+
+        :return: A tuple ``(node, category)`` with the :class:`APINode`
+         defining the object and its category, or None if the module defining
+         it doesn't export it or isn't in the tree.
+        """
+        for node, category, _, obj in self._index()[1].get(qualname, ()):
+            if category == 'variables' or \
+                    getattr(obj, '__module__', None) == node.name:
+                return node, category
+        return None
+
+    def owner(self, qualname):
+        """
+        Get the canonical node to document an object exported in the tree.
+
+        The owner is the node of the module defining the object, as reported
+        by its ``__module__``, if it exports it. Otherwise, it's the exporting
+        node of the nearest package containing that module, or else the first
+        exporting node in the order of the directory.
+
+        :param str qualname: Fully qualified name of the object. See
+         :meth:`qualname`.
+
+        :return: A tuple ``(node, name)`` with the owner :class:`APINode` and
+         the public name of the object in it, or None if no node exports it.
+        """
+        owner = None
+        depth = 0
+        for node, category, obj_name, obj in \
+                self._index()[1].get(qualname, ()):
+            if owner is None:
+                owner = (node, obj_name)
+
+            module = node.name
+            if category != 'variables':
+                module = getattr(obj, '__module__', None)
+            if node.depth() > depth and (
+                    module == node.name or
+                    module.startswith(node.name + '.')):
+                owner = (node, obj_name)
+                depth = node.depth()
+        return owner
 
     def has_public_api(self):
         """
@@ -227,9 +1248,7 @@ class APINode(object):
         :rtype: bool
         :return: True if the current node is the root node.
         """
-        for key in self.directory.keys():
-            return key == self.name
-        raise Exception('Empty directory!')
+        return self._is_root
 
     def is_relevant(self):
         """
@@ -246,6 +1265,13 @@ class APINode(object):
         if self._relevant is not None:
             return self._relevant
 
+        with measure(self._profiler, self.name, 'relevance'):
+            return self._is_relevant()
+
+    def _is_relevant(self):
+        """
+        Determine if this branch of the tree is relevant.
+        """
         relevant = False
         if self.has_public_api() or \
                 any(s.is_relevant() for s in self.subnodes):
@@ -263,19 +1289,58 @@ class APINode(object):
         :return: The depth of the node. For example, for node ``my.add.foo``
          the depth is 3.
         """
-        return len(self.name.split('.'))
+        return self._depth
 
     def get_module(self, name):
         """
         Get a module node by it's name.
 
-        This is just a helper that does lookup on the directory index.
+        This is just a helper that does lookup on the directory index. In lazy
+        trees, only the branch leading to the module is expanded.
 
         :rtype: :class:`APINode` or None
         :return: The module node identified by ``name`` in the tree. ``None``
          if the name doesn't exists.
         """
-        return self.directory.get(name, None)
+        node = self._directory.get(name, None)
+        if node is not None:
+            return node
+
+        # Expand the branch leading to the module
+        node = self._root()
+        if not name.startswith(node.name + '.'):
+            return None
+
+        for part in name[len(node.name) + 1:].split('.'):
+            if not node.subnodes:
+                return None
+            node = self._directory.get('{}.{}'.format(node.name, part), None)
+            if node is None:
+                return None
+        return node
+
+    def refresh(self):
+        """
+        Inspect again the module of this node and update its public API.
+
+        The module is only imported again if it isn't in
+        :py:data:`sys.modules`, so to reflect the changes in its source it must
+        be removed from it first. The subnodes are not updated. The relevance
+        of this node and its ancestors is determined again the next time it is
+        checked.
+        """
+        self.module, self._public = self._inspect(
+            self.name, self._static, self._profiler
+        )
+        self._load()
+        root = self._root()
+        root._exporters = None
+        root._objects = None
+
+        node = self
+        while node is not None:
+            node._relevant = None
+            node = node.parent
 
     def walk(self):
         """
@@ -285,7 +1350,7 @@ class APINode(object):
          node in the tree.
         """
         if self.is_leaf():
-            raise StopIteration()
+            return
 
         yield (self, [n for n in self.subnodes if n.is_leaf()])
 
@@ -346,5 +1411,5 @@ class APINode(object):
         return self.name
 
 
-__all__ = ['APINode']
+__all__ = ['APINode', 'NodeSummary']
 __api__ = []
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Persistent on-disk cache of the public API of modules.
+
+The cache stores, for each module, the summary of its public API as produced
+by the workers of :meth:`autoapi.APINode.build`. Each entry is keyed by the
+location, modification time and size of the module source file, so entries of
+modules that changed are considered stale and the module is inspected again.
+
+The public API of a module that re-exports objects from other modules, like
+the entry point of a package, also depends on the source of the modules
+defining those objects. Entries also store the location, modification time and
+size of the source files of those modules, and are considered stale if any of
+them changed. Those modules are the ones followed by the static analysis, and
+the ones given by the ``__module__`` of imported functions and classes. As
+imported variables don't know their module, their source is analyzed to find
+it, falling back to all the modules imported by the module exporting them.
+"""
+
+import pickle
+from os import makedirs, replace, stat
+from logging import getLogger
+from os.path import join, exists
+
+from . import __version__
+from .static import find_spec
+
+
+log = getLogger(__name__)
+
+
+# Version of the format of the entries, to discard entries of older formats
+FORMAT = 7
+
+
+class APICache(object):
+    """
+    Cache of module summaries stored in a directory.
+
+    :param str directory: Directory to store the cache entries in. It will be
+     created if it doesn't exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, name):
+        return join(self.directory, '{}.pickle'.format(name))
+
+    @staticmethod
+    def key(spec, static):
+        """
+        Compute the key of a module.
+
+        :param spec: The module specification. See
+         :func:`autoapi.static.find_spec`.
+        :param bool static: If the module public API was determined by static
+         analysis.
+
+        :rtype: tuple
+        :return: A tuple with the module source location, modification time
+         and size, the analysis mode and the version of the format.
+        """
+        origin = getattr(spec, 'origin', None)
+        if not origin or not exists(origin):
+            return (origin, None, None, static, __version__, FORMAT)
+
+        info = stat(origin)
+        return (
+            origin, info.st_mtime_ns, info.st_size, static,
+            __version__, FORMAT,
+        )
+
+    @classmethod
+    def _stamps(cls, modules):
+        """
+        Get the keys of the source of the given modules.
+        """
+        stamps = {}
+        for module in modules:
+            try:
+                stamps[module] = cls.key(find_spec(module), False)
+            except Exception:
+                stamps[module] = None
+        return stamps
+
+    @staticmethod
+    def dependencies(summary):
+        """
+        Get the other modules a module exports objects from.
+
+        :param dict summary: Summary of the module.
+
+        :rtype: set
+        :return: The names of the modules defining its public functions,
+         classes and exceptions, and of the modules its public objects were
+         found in, other than the module itself.
+        """
+        modules = {
+            obj.__module__
+            for category, elements in summary['api'].items()
+            if category != 'variables'
+            for obj_name, obj in elements
+        }
+        modules.update(summary.get('dependencies', ()))
+        modules.difference_update((None, summary['name']))
+        return modules
+
+    def get(self, name, key):
+        """
+        Get the summary of a module.
+
+        :param str name: Name of the module.
+        :param tuple key: Current key of the module. See :meth:`key`.
+
+        :return: The cached summary or None if missing or stale.
+        """
+        path = self._path(name)
+        if exists(path):
+            try:
+                with open(path, 'rb') as fd:
+                    entry = pickle.load(fd)
+                if entry['key'] == key and self._stamps(
+                        entry['dependencies']) == entry['dependencies']:
+                    self.hits += 1
+                    return entry['summary']
+            except Exception:
+                log.warning('Ignoring corrupt cache entry {}'.format(path))
+
+        self.misses += 1
+        return None
+
+    def set(self, name, key, summary):
+        """
+        Store the summary of a module.
+
+        :param str name: Name of the module.
+        :param tuple key: Current key of the module. See :meth:`key`.
+        :param dict summary: Summary of the module.
+        """
+        makedirs(self.directory, exist_ok=True)
+        dependencies = self._stamps(self.dependencies(summary))
+
+        path = self._path(name)
+        tmp = '{}.tmp'.format(path)
+        with open(tmp, 'wb') as fd:
+            pickle.dump(
+                {
+                    'key': key,
+                    'dependencies': dependencies,
+                    'summary': summary,
+                }, fd,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        replace(tmp, path)
+
+
+__all__ = ['APICache']
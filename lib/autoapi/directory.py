@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Directory of the modules of a tree, indexed by the prefixes of their names.
+
+The directory is an :py:class:`OrderedDict` that keeps, next to the modules in
+the order they were registered, a sorted list of their names. As the name of
+the descendants of a module ``a.b`` are all the names starting with ``a.b.``,
+they are a contiguous range of the sorted list, found with two binary searches
+instead of scanning all the modules.
+
+The sorted list is built the first time it is needed after the modules
+change, so registering the modules of a tree while building it has no extra
+cost.
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+class Directory(OrderedDict):
+    """
+    Ordered mapping between the names of modules and their nodes, with queries
+    by prefix of the names.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._names = None
+        super(Directory, self).__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._names = None
+        super(Directory, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._names = None
+        super(Directory, self).__delitem__(key)
+
+    def pop(self, *args):
+        self._names = None
+        return super(Directory, self).pop(*args)
+
+    def popitem(self, last=True):
+        self._names = None
+        return super(Directory, self).popitem(last=last)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._names = None
+        return super(Directory, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._names = None
+        super(Directory, self).update(*args, **kwargs)
+
+    def clear(self):
+        self._names = None
+        super(Directory, self).clear()
+
+    def _range(self, prefix):
+        """
+        Get the range of the sorted names of the descendants of a module.
+        """
+        if self._names is None:
+            self._names = sorted(self)
+
+        start = bisect_left(self._names, prefix + '.')
+        # The slash is the character that follows the dot
+        end = bisect_left(self._names, prefix + '/', start)
+        return start, end
+
+    def descendants(self, prefix):
+        """
+        Get the nodes of all the modules below a module.
+
+        :param str prefix: Name of the module. It doesn't need to be in the
+         directory.
+
+        :return: An iterator of the nodes, in order of their names, which
+         lists each module before its submodules.
+        """
+        start, end = self._range(prefix)
+        names = self._names
+        for index in range(start, end):
+            yield self[names[index]]
+
+    def ancestors(self, name):
+        """
+        Get the nodes of the modules above a module.
+
+        :param str name: Name of the module. It doesn't need to be in the
+         directory, so the first node is its nearest existing ancestor.
+
+        :rtype: list
+        :return: The nodes of the ancestors in the directory, from the nearest
+         to the farthest.
+        """
+        nodes = []
+        while '.' in name:
+            name = name.rpartition('.')[0]
+            node = self.get(name)
+            if node is not None:
+                nodes.append(node)
+        return nodes
+
+    def subtree_size(self, name):
+        """
+        Count the modules of the subtree of a module.
+
+        :param str name: Name of the module.
+
+        :rtype: int
+        :return: The number of modules in the subtree, including the module
+         itself if it's in the directory.
+        """
+        start, end = self._range(name)
+        return end - start + (name in self)
+
+
+__all__ = ['Directory']
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Selection of the submodules of a tree by name, before importing them.
+
+Patterns can be strings, matched as shell-style globs against the full dotted
+name of the module, like ``mypackage.tests*``, or compiled regular expressions,
+which must match the whole name.
+
+A module that is not selected is skipped together with all its submodules,
+so include patterns must also match the packages leading to the wanted
+modules, for example ``mypackage.api*`` instead of ``mypackage.api.*``.
+"""
+
+from fnmatch import fnmatchcase
+
+
+class ModuleFilter(object):
+    """
+    Predicate that selects the submodules of a tree.
+
+    :param str root: Name of the root module of the tree. The root module is
+     always selected.
+    :param list include: Patterns of the modules to select. If None, the
+     default, all modules are selected.
+    :param list exclude: Patterns of the modules to skip. Exclude patterns have
+     precedence over include patterns.
+    :param int max_depth: Maximum number of levels of submodules below the
+     root module. If None, the default, there is no limit.
+    """
+
+    def __init__(self, root, include=None, exclude=None, max_depth=None):
+        self.root = root
+        self.include = tuple(include) if include is not None else None
+        self.exclude = tuple(exclude or ())
+        self.max_depth = max_depth
+        self._depth = root.count('.')
+
+    @classmethod
+    def create(cls, root, include=None, exclude=None, max_depth=None):
+        """
+        Create a filter only if there is something to filter.
+
+        :rtype: :class:`ModuleFilter` or None
+        :return: A new filter, or None if all modules are selected.
+        """
+        if include is None and not exclude and max_depth is None:
+            return None
+        return cls(
+            root, include=include, exclude=exclude, max_depth=max_depth,
+        )
+
+    @staticmethod
+    def _matches(name, patterns):
+        for pattern in patterns:
+            if isinstance(pattern, str):
+                if fnmatchcase(name, pattern):
+                    return True
+            elif pattern.fullmatch(name) is not None:
+                return True
+        return False
+
+    def __call__(self, name):
+        """
+        Check if a module is selected.
+
+        :param str name: Full dotted name of the module.
+
+        :rtype: bool
+        :return: True if the module must be included in the tree.
+        """
+        if name == self.root:
+            return True
+
+        if self.max_depth is not None and \
+                name.count('.') - self._depth > self.max_depth:
+            return False
+
+        if self._matches(name, self.exclude):
+            return False
+
+        if self.include is not None:
+            return self._matches(name, self.include)
+
+        return True
+
+
+__all__ = ['ModuleFilter']
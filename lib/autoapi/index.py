@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Serializable index of a whole :class:`autoapi.APINode` tree.
+
+An index stores, for each node of a tree and in top-down order, its name, the
+names of the subnodes that failed to import and the reasons, and its public
+objects by category, with their qualified names, kinds, defining module,
+summary, base classes and value representation.
+
+Indexes can be written as JSON or in a compact binary format, based on
+:py:mod:`pickle`. As with any pickle, only load binary indexes from trusted
+sources.
+
+Loading an index builds a read-only tree, with the same API of a regular tree,
+without importing any module. Public objects are represented by
+:class:`autoapi.static.StaticObject`, whose docstring is the summary of the
+original object.
+
+Indexes can be created from the command line:
+
+::
+
+   python3 -m autoapi.index mymodule --output mymodule.json
+"""
+
+import json
+import pickle
+from types import MappingProxyType
+from argparse import ArgumentParser
+from collections import OrderedDict
+
+from . import __version__
+from .apinode import APINode
+from .static import StaticObject
+from .summary import summarize
+
+
+FORMAT = 1
+
+
+def _record(name, obj, category):
+    """
+    Serialize a public object.
+    """
+    if not isinstance(obj, StaticObject):
+        obj = StaticObject.from_object(name, obj, category)
+
+    return OrderedDict((
+        ('name', obj.__name__),
+        ('qualname', obj.__qualname__),
+        ('module', obj.__module__),
+        ('kind', obj.kind),
+        ('summary', summarize(obj) if obj.kind != 'variable' else None),
+        ('bases', obj.bases),
+        ('value', obj.value),
+    ))
+
+
+def serialize(tree):
+    """
+    Serialize a tree to plain data.
+
+    :param tree: The root :class:`autoapi.APINode` of the tree to serialize.
+
+    :rtype: dict
+    :return: A dictionary with plain Python types.
+    """
+    nodes = []
+    for node in tree.directory.values():
+        nodes.append(OrderedDict((
+            ('name', node.name),
+            ('failed', list(node.subnodes_failed)),
+            ('failures', OrderedDict(node.failures)),
+            ('api', OrderedDict(
+                (category, [
+                    [obj_name, _record(obj_name, obj, category)]
+                    for obj_name, obj in elements.items()
+                ])
+                for category, elements in node.api.items()
+            )),
+        )))
+
+    return OrderedDict((
+        ('format', FORMAT),
+        ('autoapi', __version__),
+        ('root', tree.name),
+        ('nodes', nodes),
+    ))
+
+
+def deserialize(data):
+    """
+    Build a read-only tree from plain data.
+
+    :param dict data: Data as returned by :func:`serialize`.
+
+    :rtype: :class:`autoapi.APINode`
+    :return: The root node of the tree.
+    """
+    if data.get('format') != FORMAT:
+        raise ValueError(
+            'Unsupported index format {}'.format(data.get('format'))
+        )
+
+    def summaries():
+        for node in data['nodes']:
+            api = OrderedDict()
+            for category, elements in node['api'].items():
+                api[category] = [
+                    (obj_name, StaticObject(
+                        record['name'], record['module'], record['kind'],
+                        doc=record['summary'],
+                        bases=record['bases'],
+                        value=record['value'],
+                        qualname=record['qualname'],
+                    ))
+                    for obj_name, record in elements
+                ]
+            yield {'name': node['name'], 'api': api}
+
+    tree = APINode._merge(summaries())
+    records = {node['name']: node for node in data['nodes']}
+
+    # Make the tree read-only
+    for node in tree.directory.values():
+        node._subnodes = tuple(node._subnodes)
+        node._subnodes_failed = tuple(records[node.name]['failed'])
+        node._failures = MappingProxyType(OrderedDict(
+            records[node.name].get('failures', {})
+        ))
+        node._api = MappingProxyType(OrderedDict(
+            (category, MappingProxyType(elements))
+            for category, elements in node._api.items()
+        ))
+
+    tree.is_relevant()
+    return tree
+
+
+def save(tree, path, binary=False):
+    """
+    Write the index of a tree to a file.
+
+    :param tree: The root :class:`autoapi.APINode` of the tree.
+    :param str path: Path of the file to write.
+    :param bool binary: Use the binary format instead of JSON.
+    """
+    data = serialize(tree)
+
+    if binary:
+        with open(path, 'wb') as fd:
+            pickle.dump(data, fd, protocol=pickle.HIGHEST_PROTOCOL)
+        return
+
+    with open(path, 'w') as fd:
+        json.dump(data, fd, separators=(',', ':'))
+
+
+def load(path):
+    """
+    Load the index of a tree from a file, in any format.
+
+    :param str path: Path of the file to read.
+
+    :rtype: :class:`autoapi.APINode`
+    :return: The root node of the read-only tree.
+    """
+    with open(path, 'rb') as fd:
+        content = fd.read()
+
+    if content[:1] == b'{':
+        data = json.loads(content.decode('utf-8'))
+    else:
+        data = pickle.loads(content)
+
+    return deserialize(data)
+
+
+def main():
+    parser = ArgumentParser(
+        description='Write the API index of a package.'
+    )
+    parser.add_argument('module')
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--binary', action='store_true')
+    parser.add_argument('--static', action='store_true')
+    parser.add_argument('--jobs', type=int, default=None)
+    args = parser.parse_args()
+
+    tree = APINode.build(args.module, jobs=args.jobs, static=args.static)
+    save(tree, args.output, binary=args.binary)
+
+
+__all__ = ['serialize', 'deserialize', 'save', 'load']
+
+
+if __name__ == '__main__':
+    main()
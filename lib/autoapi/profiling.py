@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Instrumentation of the tree construction and page rendering.
+
+A :class:`Profiler` records the wall time, and optionally the memory delta,
+spent on each node of the tree in the following phases:
+
+- ``import``: Import, or static analysis, of the module.
+- ``extract``: Extraction and categorization of the public API.
+- ``relevance``: Determination of the relevance of the node. This time
+  includes the time spent on the subnodes.
+- ``render``: Rendering of the page of the node.
+
+Memory deltas are measured with :py:mod:`tracemalloc`, which has a
+considerable overhead and measures the memory of the whole process, so they
+are only meaningful when the tree is built and rendered serially.
+"""
+
+import json
+import tracemalloc
+from threading import Lock
+from time import perf_counter
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+PHASES = ('import', 'extract', 'relevance', 'render')
+
+
+class Profiler(object):
+    """
+    Recorder of the time and memory spent on each node.
+
+    :param bool memory: Also record the memory delta of each phase.
+
+    **Attributes:**
+
+    :var records: A :py:class:`OrderedDict` mapping the name of each node with
+     a :py:class:`OrderedDict` mapping each phase with a dictionary with the
+     ``time`` in seconds and the ``memory`` delta in bytes, or None if memory
+     is not being recorded.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = OrderedDict()
+        self._callbacks = []
+        self._lock = Lock()
+        self._tracing = False
+
+    def subscribe(self, callback):
+        """
+        Subscribe a callback to all records.
+
+        :param callback: A callable that will be called with the arguments
+         ``(name, phase, time, memory)`` each time a phase of a node is
+         recorded.
+        """
+        self._callbacks.append(callback)
+
+    def record(self, name, phase, time, memory=None):
+        """
+        Record the time and memory spent on a phase of a node.
+
+        :param str name: Name of the node.
+        :param str phase: Name of the phase. See :data:`PHASES`.
+        :param float time: Wall time in seconds.
+        :param int memory: Memory delta in bytes, or None if unknown.
+        """
+        with self._lock:
+            self.records.setdefault(name, OrderedDict())[phase] = {
+                'time': time,
+                'memory': memory,
+            }
+
+        for callback in self._callbacks:
+            callback(name, phase, time, memory)
+
+    @contextmanager
+    def measure(self, name, phase):
+        """
+        Context manager that records the time and memory spent in its block.
+
+        :param str name: Name of the node.
+        :param str phase: Name of the phase. See :data:`PHASES`.
+        """
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        memory = None
+        if self.memory:
+            memory = tracemalloc.get_traced_memory()[0]
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            if memory is not None:
+                memory = tracemalloc.get_traced_memory()[0] - memory
+            self.record(name, phase, elapsed, memory)
+
+    def stop(self):
+        """
+        Stop tracing the memory allocations, if this profiler started it.
+
+        Tracing has a considerable overhead on everything that runs while it
+        is enabled, so it must be stopped once profiling is done.
+        """
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def report(self):
+        """
+        Get the structured report of all records.
+
+        :rtype: dict
+        :return: A dictionary with the ``nodes`` records and the ``totals``
+         time in seconds of each phase.
+        """
+        totals = OrderedDict((phase, 0.0) for phase in PHASES)
+        for phases in self.records.values():
+            for phase, measure in phases.items():
+                totals[phase] = totals.get(phase, 0.0) + measure['time']
+
+        return {
+            'nodes': self.records,
+            'totals': totals,
+        }
+
+    def dump(self, path):
+        """
+        Write the report as JSON.
+
+        :param str path: Path of the file to write.
+        """
+        with open(path, 'w') as fd:
+            json.dump(self.report(), fd, indent=4)
+
+    def top(self, count=10):
+        """
+        Get the most expensive phases of all nodes.
+
+        :param int count: Number of entries to return.
+
+        :rtype: list
+        :return: A list of tuples ``(name, phase, time, memory)`` sorted by
+         time, most expensive first.
+        """
+        entries = [
+            (name, phase, measure['time'], measure['memory'])
+            for name, phases in self.records.items()
+            for phase, measure in phases.items()
+        ]
+        entries.sort(key=lambda entry: entry[2], reverse=True)
+        return entries[:count]
+
+
+@contextmanager
+def measure(profiler, name, phase):
+    """
+    Measure a block with the given profiler, if any.
+
+    :param profiler: A :class:`Profiler` or None.
+    :param str name: Name of the node.
+    :param str phase: Name of the phase. See :data:`PHASES`.
+    """
+    if profiler is None:
+        yield
+        return
+
+    with profiler.measure(name, phase):
+        yield
+
+
+__all__ = ['PHASES', 'Profiler']
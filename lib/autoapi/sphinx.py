@@ -19,23 +19,46 @@
 Glue for Sphinx API.
 """
 
-from inspect import getdoc
-from functools import wraps
+import sys
+from time import perf_counter
+from itertools import repeat
+from functools import wraps, partial
 from traceback import format_exc
-from os.path import join, dirname, abspath, exists
+from os import cpu_count, listdir, remove, replace
+from os.path import join, dirname, abspath, exists, isdir
 
+from jinja2 import FileSystemBytecodeCache, FileSystemLoader
 from jinja2.sandbox import SandboxedEnvironment
 from sphinx.util.osutil import ensuredir
 from sphinx.util.logging import getLogger
 from sphinx.jinja2glue import BuiltinTemplateLoader
 
 from . import __version__
-from .apinode import APINode
+from .cache import APICache
+from .apinode import APINode, NodeSummary
+from .static import StaticObject, base_names
+from .workers import WorkerError, WorkerPool
+from .index import load as load_index
+from .profiling import Profiler, measure
+from .summary import IdentityCache, SummaryCache
+from .values import CHARS, ITEMS, DEPTH, render_value
 
 
 log = getLogger(__name__)
 
 
+# Values of the diagrams option
+DIAGRAMS = ('class', 'module', 'none')
+
+
+# Bases that don't make an inheritance diagram worth drawing
+TRIVIAL_BASES = {'object', 'Exception', 'BaseException'}
+
+
+# Summaries of the public objects, shared by all pages and builds
+summaries = SummaryCache()
+
+
 def handle_exception(func):
     """
     Utility decorator to report all exceptions in module without making Sphinx
@@ -59,13 +82,14 @@ def filter_summary(obj):
     """
     Jinja2 filter that allows to extract the documentation summary of an
     object.
+
+    Summaries are computed once per object and reused by all pages.
     """
     try:
-        doc = getdoc(obj)
-        if doc is None:
+        summary = summaries.get(obj)
+        if summary is None:
             return 'Undocumented.'
 
-        summary = doc.split('\n').pop(0)
         summary.replace('\\', '\\\\')  # Escape backslash in RST
         return summary
     except Exception:
@@ -77,10 +101,44 @@ def filter_summary(obj):
     return 'AutoApi: Unable to determine summary.'
 
 
-def get_template_env(app):
+def filter_value(values, obj):
+    """
+    Jinja2 filter that allows to represent the value of a variable.
+
+    The representation is bounded by the ``autoapi_value_chars``,
+    ``autoapi_value_items`` and ``autoapi_value_depth`` configuration values,
+    and computed once per object. See :mod:`autoapi.values`.
+
+    :param values: The :class:`autoapi.summary.IdentityCache` of the
+     representations.
+    :param obj: The value to represent.
+    """
+    try:
+        return values.get(obj)
+    except Exception:
+        log.error(
+            'AutoApi failed to represent the value of obj: {}'.format(
+                type(obj)
+            )
+        )
+        log.error(format_exc())
+
+    return 'AutoApi: Unable to represent the value.'
+
+
+def get_template_env(app, bytecode_dir=None):
     """
     Get the template environment.
 
+    :param app: The Sphinx application.
+    :param str bytecode_dir: Directory to store the compiled templates in, so
+     they are not compiled again in subsequent builds. If None, the default,
+     templates are compiled in each build.
+
+    The settings needed to create the same environment in a worker process
+    are kept in its ``autoapi_settings`` attribute. See
+    :func:`create_template_env`.
+
     .. note::
 
        Template should be loaded as a package_data using
@@ -92,90 +150,688 @@ def get_template_env(app):
     template_dir = [join(dirname(abspath(__file__)), 'templates')]
     template_loader = BuiltinTemplateLoader()
     template_loader.init(app.builder, dirs=template_dir)
-    template_env = SandboxedEnvironment(loader=template_loader)
+
+    settings = {
+        'searchpath': [str(path) for path in template_loader.pathchain],
+        'bytecode_dir': bytecode_dir,
+        'chars': app.config.autoapi_value_chars,
+        'items': app.config.autoapi_value_items,
+        'depth': app.config.autoapi_value_depth,
+    }
+    return create_template_env(settings, template_loader)
+
+
+def create_template_env(settings, loader=None):
+    """
+    Create a template environment with the autoapi filters.
+
+    :param dict settings: Settings of the environment, with the
+     ``searchpath`` of the templates, the ``bytecode_dir`` of the compiled
+     templates, and the ``chars``, ``items`` and ``depth`` limits of the
+     values.
+    :param loader: Template loader. If None, the default, the templates are
+     loaded from the ``searchpath``.
+    """
+    if loader is None:
+        loader = FileSystemLoader(settings['searchpath'])
+
+    bytecode_cache = None
+    if settings['bytecode_dir'] is not None:
+        ensuredir(settings['bytecode_dir'])
+        bytecode_cache = FileSystemBytecodeCache(settings['bytecode_dir'])
+
+    template_env = SandboxedEnvironment(
+        loader=loader, bytecode_cache=bytecode_cache,
+    )
     template_env.filters['summary'] = filter_summary
+
+    values = IdentityCache(partial(
+        render_value,
+        chars=settings['chars'],
+        items=settings['items'],
+        depth=settings['depth'],
+    ))
+    template_env.filters['value'] = partial(filter_value, values)
+    template_env.autoapi_settings = settings
     return template_env
 
 
-@handle_exception
-def builder_inited(app):
+# Template environment of the worker processes
+_worker_env = None
+
+
+def _initialize_renderer(path, settings):
     """
-    autoapi Sphinx extension hook for the ``builder-inited`` event.
+    Initialize a worker process to render pages.
+    """
+    global _worker_env
+    sys.path[:] = path
+    _worker_env = create_template_env(settings)
 
-    This hook will read the configuration value ``autoapi_modules`` and render
-    the modules described in it.
 
-    See http://sphinx-doc.org/extdev/appapi.html#event-builder-inited
+def _render_chunk(template_name, pages):
     """
-    # Get modules to build documentation for
-    modules = app.config.autoapi_modules
-    if not modules:
+    Render and write a chunk of pages. Executed in the worker processes.
+
+    :return: A list of tuples ``(written, time)`` for each page, with True as
+     ``written`` if the page changed, and the time spent rendering it.
+    """
+    template = _worker_env.get_template(template_name)
+    results = []
+    for out_file, context in pages:
+        start = perf_counter()
+        written = write_page(out_file, template.generate(**context))
+        results.append((written, perf_counter() - start))
+    return results
+
+
+def is_portable(node):
+    """
+    Check if the page of a node can be rendered in another process.
+
+    :param node: The :class:`autoapi.APINode` of the page.
+
+    :rtype: bool
+    :return: True if all the public objects of the node are
+     :class:`autoapi.static.StaticObject`.
+    """
+    return all(
+        isinstance(obj, StaticObject)
+        for elements in node.api.values()
+        for obj in elements.values()
+    )
+
+
+def render_pages(template, pages, jobs=None, profiler=None):
+    """
+    Render pages and write them, optionally in a pool of processes.
+
+    Each page is rendered as a stream of chunks straight into its file, so the
+    memory used doesn't depend on the size of the page. See
+    :func:`write_page`.
+
+    Rendering is bound by the interpreter, so the pages are only rendered in
+    parallel when they can be sent to worker processes: when all their
+    public objects are :class:`autoapi.static.StaticObject`, as in the trees
+    built with more than one job, with ``light`` or loaded from an index.
+    Otherwise they are rendered serially.
+
+    :param template: The template to render.
+    :param list pages: List of tuples ``(out_file, context)`` with the path and
+     the template context of each page.
+    :param int jobs: Number of processes to render with. If None or one, the
+     default, the pages are rendered serially.
+    :param profiler: Profiler to record the time spent rendering each page.
+     See :class:`autoapi.profiling.Profiler`.
+
+    :return: An iterator of tuples ``(out_file, written)``, in the same order
+     of the given pages, with True as ``written`` if the page changed.
+    """
+    settings = getattr(template.environment, 'autoapi_settings', None)
+
+    if not jobs or jobs <= 1 or len(pages) <= 1 or settings is None or \
+            not all(is_portable(context['node']) for _, context in pages):
+        for out_file, context in pages:
+            with measure(profiler, context['node'].name, 'render'):
+                written = write_page(out_file, template.generate(**context))
+            yield out_file, written
         return
 
-    # Get template environment
-    template_env = get_template_env(app)
+    # Send the pages in a few chunks per process, to amortize the transfer
+    portable = []
+    for out_file, context in pages:
+        context = dict(context)
+        context['node'] = context['node'].detached()
+        context['subnodes'] = [
+            NodeSummary(subnode.name, subnode.is_relevant())
+            for subnode in context['subnodes']
+        ]
+        portable.append((out_file, context))
+
+    size = -(-len(portable) // (jobs * 4))
+    chunks = [
+        portable[index:index + size]
+        for index in range(0, len(portable), size)
+    ]
+
+    with WorkerPool(
+            jobs, initializer=_initialize_renderer,
+            initargs=(list(sys.path), settings)) as pool:
+
+        for chunk, results in zip(chunks, pool.map(
+                _render_chunk, repeat(template.name), chunks)):
+
+            if isinstance(results, WorkerError):
+                raise Exception(
+                    'Failed to render {}:\n{}'.format(
+                        ', '.join(out_file for out_file, _ in chunk),
+                        results.reason,
+                    )
+                )
 
-    for module, overrides in modules.items():
+            for (out_file, context), (written, elapsed) in zip(
+                    chunk, results):
+                if profiler is not None:
+                    profiler.record(context['node'].name, 'render', elapsed)
+                yield out_file, written
 
-        # Get options
-        options = {
-            'prune': False,
-            'override': True,
-            'template': 'module',
-            'output': module
-        }
-        if overrides:
-            options.update(overrides)
 
-        # Get template
-        template = template_env.get_template(
-            'autoapi/{}.rst'.format(options['template'])
+def write_page(out_file, content):
+    """
+    Write a page only if its content changed.
+
+    Keeping the modification time of unchanged pages allows Sphinx to only
+    read again the pages of the modules that changed.
+
+    The content is compared with the existing page chunk by chunk, and as soon
+    as they differ it is written to a temporary file that then replaces the
+    page, so the whole content is never held in memory.
+
+    :param str out_file: Path to the page.
+    :param content: Rendered content of the page, as a string or as an
+     iterable of strings.
+
+    :rtype: bool
+    :return: True if the page was written.
+    """
+    if isinstance(content, str):
+        content = [content]
+    chunks = iter(content)
+
+    # Compare the content with the existing page while it matches
+    matched = 0
+    chunk = None
+    if exists(out_file):
+        with open(out_file, 'r') as fd:
+            for chunk in chunks:
+                if fd.read(len(chunk)) != chunk:
+                    break
+                matched += len(chunk)
+            else:
+                if not fd.read(1):
+                    return False
+                chunk = None
+
+    # Write the matched prefix, the differing chunk and the rest
+    tmp = '{}.tmp'.format(out_file)
+    try:
+        with open(tmp, 'w') as fd:
+            if matched:
+                with open(out_file, 'r') as existing:
+                    fd.write(existing.read(matched))
+            if chunk is not None:
+                fd.write(chunk)
+            for chunk in chunks:
+                fd.write(chunk)
+    except BaseException:
+        # Rendering can fail midway, don't leave partial pages behind
+        if exists(tmp):
+            remove(tmp)
+        raise
+
+    replace(tmp, out_file)
+    return True
+
+
+def stale_pages(out_dir, module, source_suffix, generated):
+    """
+    Find the pages of a module that weren't generated in this build.
+
+    :param str out_dir: Output directory of the module pages.
+    :param str module: Name of the root module.
+    :param str source_suffix: Suffix of the pages.
+    :param set generated: Path of all pages generated in this build.
+
+    :return: An iterator of the paths to the stale pages.
+    """
+    if not isdir(out_dir):
+        return
+
+    for filename in sorted(listdir(out_dir)):
+        if not filename.endswith(source_suffix):
+            continue
+
+        name = filename[:-len(source_suffix)]
+        if name != module and not name.startswith(module + '.'):
+            continue
+
+        path = join(out_dir, filename)
+        if path not in generated:
+            yield path
+
+
+def report_profile(app, profiler):
+    """
+    Write the profiling report and log the most expensive entries.
+
+    The report is written as JSON to the path in the ``autoapi_profile``
+    configuration value, relative to the output directory. Memory tracing is
+    stopped first, so it doesn't slow down the rest of the build.
+    """
+    profiler.stop()
+
+    ensuredir(app.outdir)
+    path = join(app.outdir, app.config.autoapi_profile)
+    profiler.dump(path)
+
+    lines = ['autoapi profile written to {}'.format(path)]
+    for name, phase, time, memory in profiler.top(
+            app.config.autoapi_profile_top):
+        line = '{:>10.4f}s {:<10} {}'.format(time, phase, name)
+        if memory is not None:
+            line = '{} ({:+.1f} KiB)'.format(line, memory / 1024)
+        lines.append(line)
+    log.info('\n'.join(lines))
+
+
+class TreeRegistry(object):
+    """
+    Registry of the trees built for the entries of ``autoapi_modules``.
+
+    Entries for modules inside the tree of another entry built the same way
+    reuse its nodes instead of inspecting the modules again, and document the
+    subtree rooted at their module.
+    """
+
+    def __init__(self):
+        self._trees = []
+
+    @staticmethod
+    def key(options):
+        """
+        Get the key of the options that determine the content of a tree.
+
+        :param dict options: Options of the entry.
+
+        :return: The key, or None if the tree can't be shared because its
+         modules are filtered.
+        """
+        if options['include'] is not None or options['exclude'] or \
+                options['max_depth'] is not None:
+            return None
+
+        # Trees built in worker processes or light have no modules
+        return (
+            options['static'], options['index'], options['light'],
+            options['timeout'], options['restore_modules'],
+            (options['jobs'] or 1) > 1,
         )
 
-        # Build API tree
-        tree = APINode(module)
+    def get(self, module, key):
+        """
+        Get the node of a module from the registered trees.
+
+        :param str module: Name of the module.
+        :param key: Key of the options of the entry. See :meth:`key`.
+
+        :rtype: :class:`autoapi.APINode` or None
+        :return: The node of the module, or None if not found.
+        """
+        if key is None:
+            return None
+
+        for tree, tree_key in self._trees:
+            if tree_key != key:
+                continue
+            if module == tree.name or module.startswith(tree.name + '.'):
+                node = tree.get_module(module)
+                if node is not None:
+                    return node
+        return None
+
+    def add(self, tree, key):
+        """
+        Register a tree.
+
+        :param tree: The root :class:`autoapi.APINode` of the tree.
+        :param key: Key of the options of the entry. See :meth:`key`.
+        """
+        if key is not None:
+            self._trees.append((tree, key))
+
+
+def get_options(module, overrides=None):
+    """
+    Get the options of an entry of ``autoapi_modules``.
+
+    :param str module: Name of the module.
+    :param dict overrides: Options set by the user, if any.
+
+    :rtype: dict
+    :return: All the options of the entry.
+    """
+    options = {
+        'prune': False,
+        'override': True,
+        'static': False,
+        'jobs': 1,
+        'timeout': None,
+        'include': None,
+        'exclude': None,
+        'max_depth': None,
+        'stream': False,
+        'light': False,
+        'restore_modules': False,
+        'index': None,
+        'template': 'module',
+        'output': module,
+        'diagrams': 'class',
+        'diagrams_skip_trivial': False,
+        'diagrams_max': None,
+        'dedupe': False,
+    }
+    if overrides:
+        options.update(overrides)
+
+    if options['jobs'] == 'auto':
+        options['jobs'] = cpu_count()
+
+    if options['diagrams'] not in DIAGRAMS:
+        log.warning(
+            'autoapi unknown diagrams {!r} for {}, expected one of {}. '
+            'Using \'class\'.'.format(
+                options['diagrams'], module, ', '.join(map(repr, DIAGRAMS))
+            )
+        )
+        options['diagrams'] = 'class'
+    return options
+
+
+def cross_references(node):
+    """
+    Find the public functions, classes and exceptions of a node that are
+    documented by another node of the tree, its canonical owner. See
+    :meth:`autoapi.APINode.owner`.
+
+    :param node: The :class:`autoapi.APINode` of the page.
+
+    :rtype: dict
+    :return: A mapping between the public names of the objects documented
+     elsewhere and the full name they are documented with.
+    """
+    references = {}
+    for category in ('functions', 'classes', 'exceptions'):
+        for obj_name, obj in node.api[category].items():
+            qualname = node.qualname(obj_name, obj, category)
+            if qualname is None:
+                continue
+
+            owner, owner_name = node.owner(qualname)
+            if owner is not node or owner_name != obj_name:
+                references[obj_name] = '{}.{}'.format(owner.name, owner_name)
+    return references
 
-        # Gather nodes to document
+
+def select_diagrams(node, options, references=None):
+    """
+    Select the classes and exceptions of a node to draw inheritance diagrams
+    for.
+
+    :param node: The :class:`autoapi.APINode` of the page.
+    :param dict options: Options of the entry. See :func:`get_options`.
+    :param dict references: Objects documented by other nodes, that are
+     skipped. See :func:`cross_references`.
+
+    :return: A tuple ``(diagrams, module_diagram)`` with the list of names of
+     the classes with their own diagram, and the list of names of the classes
+     in the combined diagram of the module.
+    """
+    if options['diagrams'] == 'none':
+        return [], []
+
+    names = []
+    for elements in (node.classes, node.exceptions):
+        for obj_name, obj in elements.items():
+            if references and obj_name in references:
+                continue
+            if options['diagrams_skip_trivial'] and \
+                    set(base_names(obj)) <= TRIVIAL_BASES:
+                continue
+            names.append(obj_name)
+
+    if options['diagrams_max'] is not None:
+        names = names[:options['diagrams_max']]
+
+    if options['diagrams'] == 'module':
+        return [], names
+    return names, []
+
+
+def iter_pages(nodes, out_dir, source_suffix, options, generated=None):
+    """
+    Iterate the pages to render for the given nodes, as the nodes are
+    iterated.
+
+    :param nodes: An iterable of the :class:`autoapi.APINode` to document.
+    :param str out_dir: Output directory of the pages.
+    :param str source_suffix: Suffix of the pages.
+    :param dict options: Options of the entry. See :func:`get_options`.
+    :param set generated: If given, the path of all the pages of the nodes are
+     added to it, including the ones not overridden.
+
+    :return: An iterator of tuples ``(out_file, context)`` with the path and
+     the template context of each page.
+    """
+    for node in nodes:
+        out_file = join(out_dir, node.name + source_suffix)
+        if generated is not None:
+            generated.add(out_file)
+
+        # Skip file if it override is off and it exists
+        if not options['override'] and exists(out_file):
+            continue
+
+        # Consider only subnodes that are relevant if prune is enabled
+        subnodes = node.subnodes
         if options['prune']:
-            nodes = [
-                node for node in tree.directory.values()
-                if node.is_relevant()
+            subnodes = [
+                subnode for subnode in node.subnodes
+                if subnode.is_relevant()
             ]
+
+        # Reference the objects documented by their canonical owner
+        references = {}
+        if options['dedupe']:
+            references = cross_references(node)
+
+        diagrams, module_diagram = select_diagrams(node, options, references)
+
+        yield out_file, {
+            'node': node,
+            'subnodes': subnodes,
+            'references': references,
+            'diagrams': diagrams,
+            'module_diagram': module_diagram,
+        }
+
+
+def gather_pages(nodes, out_dir, source_suffix, options, generated=None):
+    """
+    Gather the pages to render for the given nodes. See :func:`iter_pages`.
+
+    :rtype: list
+    :return: List of tuples ``(out_file, context)`` with the path and the
+     template context of each page.
+    """
+    return list(iter_pages(nodes, out_dir, source_suffix, options, generated))
+
+
+def generate(app):
+    """
+    Render the pages of the modules described in ``autoapi_modules``.
+
+    :param app: The Sphinx application.
+
+    :rtype: list
+    :return: A list with a dictionary for each entry, with the ``module``
+     name, its ``options``, the ``tree`` node of the module, or None if
+     streamed, the ``template``, the output directory ``out_dir`` and the
+     ``source_suffix`` of the pages.
+    """
+    # Get modules to build documentation for
+    modules = app.config.autoapi_modules
+    if not modules:
+        return []
+
+    # Get the persistent cache of modules and compiled templates
+    cache = None
+    bytecode_dir = None
+    if app.config.autoapi_cache:
+        cache_dir = join(app.confdir, app.config.autoapi_cache)
+        cache = APICache(cache_dir)
+        bytecode_dir = join(cache_dir, 'templates')
+
+    # Get template environment, shared by all modules
+    template_env = get_template_env(app, bytecode_dir)
+    templates = {}
+
+    # Get the profiler
+    profiler = None
+    if app.config.autoapi_profile:
+        profiler = Profiler(memory=app.config.autoapi_profile_memory)
+        profiler.subscribe(
+            lambda *record: app.emit('autoapi-profile', *record)
+        )
+
+    # Pages generated in this build, and output directories to clean
+    generated = set()
+    cleanup = []
+    entries = []
+
+    # Trees built in this build. Packages are built before their submodules
+    # so overlapping entries can reuse their nodes.
+    registry = TreeRegistry()
+
+    for module, overrides in sorted(
+            modules.items(), key=lambda item: item[0].count('.')):
+
+        # Get options
+        options = get_options(module, overrides)
+        jobs = options['jobs']
+
+        # Get template, compiled once for all modules using it
+        template = templates.get(options['template'])
+        if template is None:
+            template = template_env.get_template(
+                'autoapi/{}.rst'.format(options['template'])
+            )
+            templates[options['template']] = template
+
+        # Stream the nodes without building the tree, or build API tree, or
+        # reuse the nodes of an overlapping entry
+        stream = options['stream'] and not options['index']
+        key = registry.key(options)
+        tree = None
+        if not stream:
+            tree = registry.get(module, key)
+
+        if stream:
+            nodes = APINode.stream(
+                module, static=options['static'], profiler=profiler,
+                include=options['include'],
+                exclude=options['exclude'],
+                max_depth=options['max_depth'],
+                restore=options['restore_modules'],
+            )
+        elif tree is not None:
+            log.info('autoapi reusing the nodes of {}'.format(module))
         else:
-            nodes = tree.directory.values()
+            if options['index']:
+                tree = load_index(join(app.confdir, options['index']))
+            else:
+                tree = APINode.build(
+                    module, jobs=jobs, static=options['static'],
+                    cache=cache, profiler=profiler,
+                    timeout=options['timeout'],
+                    include=options['include'],
+                    exclude=options['exclude'],
+                    max_depth=options['max_depth'],
+                    light=options['light'],
+                    restore=options['restore_modules'],
+                )
+            registry.add(tree, key)
 
-        if not nodes:
-            continue
+        # Gather nodes to document, in the subtree of the module
+        if not stream:
+            nodes = tree.preorder()
+        if options['prune']:
+            nodes = (node for node in nodes if node.is_relevant())
+        if not stream:
+            nodes = list(nodes)
 
         # Define output directory
         out_dir = join(app.env.srcdir, options['output'])
+        source_suffix = next(iter(app.config.source_suffix))
+
+        entries.append({
+            'module': module,
+            'options': options,
+            'tree': tree,
+            'template': template,
+            'out_dir': out_dir,
+            'source_suffix': source_suffix,
+        })
+
+        # Register the output of this module to remove stale pages later
+        if options['override']:
+            cleanup.append((out_dir, module, source_suffix))
+
+        if not stream and not nodes:
+            continue
+
         ensuredir(out_dir)
 
-        # Iterate nodes and render them
-        for node in nodes:
-            source_suffix = next(iter(app.config.source_suffix))
-            out_file = join(out_dir, node.name + source_suffix)
+        # Gather the pages to render. Streamed pages are rendered serially,
+        # as soon as their node is discovered.
+        pages = iter_pages(
+            nodes, out_dir, source_suffix, options, generated,
+        )
+        if stream:
+            jobs = None
+        else:
+            pages = list(pages)
+
+        # Render and write pages, concurrently if requested
+        rendered = 0
+        written = 0
+        for out_file, changed in render_pages(
+                template, pages, jobs, profiler):
+            rendered += 1
+            written += changed
+        log.info('autoapi wrote {} of {} pages of {}'.format(
+            written, rendered, module
+        ))
+
+    # Remove pages of modules that no longer exist
+    for out_dir, module, source_suffix in cleanup:
+        for stale in stale_pages(out_dir, module, source_suffix, generated):
+            log.info('autoapi removing stale page {}'.format(stale))
+            remove(stale)
+
+    if cache is not None:
+        log.info(
+            'autoapi cache: {} modules loaded, {} inspected'.format(
+                cache.hits, cache.misses
+            )
+        )
 
-            # Skip file if it override is off and it exists
-            if not options['override'] and exists(out_file):
-                continue
+    if profiler is not None:
+        report_profile(app, profiler)
 
-            # Consider only subnodes that are relevant if prune is enabled
-            subnodes = node.subnodes
-            if options['prune']:
-                subnodes = [
-                    subnode for subnode in node.subnodes
-                    if subnode.is_relevant()
-                ]
-
-            # Write file
-            with open(out_file, 'w') as fd:
-                fd.write(
-                    template.render(
-                        node=node,
-                        subnodes=subnodes
-                    )
-                )
+    return entries
+
+
+@handle_exception
+def builder_inited(app):
+    """
+    autoapi Sphinx extension hook for the ``builder-inited`` event.
+
+    This hook will read the configuration value ``autoapi_modules`` and render
+    the modules described in it.
+
+    See http://sphinx-doc.org/extdev/appapi.html#event-builder-inited
+    """
+    generate(app)
 
 
 def setup(app):
@@ -187,6 +843,14 @@ def setup(app):
     # autodoc is required
     app.setup_extension('sphinx.ext.autodoc')
     app.add_config_value('autoapi_modules', {}, True)
+    app.add_config_value('autoapi_cache', None, True)
+    app.add_config_value('autoapi_profile', None, '')
+    app.add_config_value('autoapi_profile_memory', False, '')
+    app.add_config_value('autoapi_profile_top', 10, '')
+    app.add_config_value('autoapi_value_chars', CHARS, True)
+    app.add_config_value('autoapi_value_items', ITEMS, True)
+    app.add_config_value('autoapi_value_depth', DEPTH, True)
+    app.add_event('autoapi-profile')
     app.connect(str('builder-inited'), builder_inited)
     return {'version': __version__}
 
@@ -0,0 +1,794 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Static discovery of the public API of a module without importing it.
+
+This module implements the analysis used by :class:`autoapi.APINode` when
+built with ``static=True``. The source code of the module is parsed with
+:py:mod:`ast` and the ``__api__`` or ``__all__`` listings, along with the
+top-level ``def``, ``class``, assignment and import statements, are used to
+catalog the public objects in the same four categories used by the node.
+
+The analysis is conservative. If the listing cannot be read as a literal list
+of strings (for example, because it is computed, extended or imported), or if
+any listed element cannot be found statically, or is a variable whose value
+is neither a literal nor an alias of another name, the analysis gives up and
+the caller must import the module to fetch its public API. The same happens
+if a listed element is decorated, is defined more than once (for example, as
+the fallback of an optional import) or is defined before a star import, as
+its actual value depends on the execution of the module.
+
+Names imported from other modules, like the re-exports commonly found in
+package entry points, are resolved by following the ``import`` statements to
+the source of the defining module, again without importing it.
+
+Classes are considered exceptions if any of its bases is a built-in exception
+or a class that can be statically determined to be an exception. Bases that
+cannot be resolved (for example, attributes of objects) are considered
+exceptions only if their name ends in ``Error`` or ``Exception``.
+"""
+
+import ast
+import sys
+import builtins
+from os import stat
+from inspect import cleandoc, getdoc
+from functools import lru_cache
+from collections import OrderedDict
+from importlib.machinery import PathFinder, SOURCE_SUFFIXES
+
+from .values import render_value
+
+
+# Mapping between the kinds of objects and the public API categories of nodes
+CATEGORIES = OrderedDict((
+    ('function', 'functions'),
+    ('class', 'classes'),
+    ('exception', 'exceptions'),
+    ('variable', 'variables'),
+))
+
+
+def base_names(cls):
+    """
+    Get the names of the bases of a class.
+
+    :param cls: The class, or a :class:`StaticObject` of a class.
+
+    :rtype: list
+    :return: The qualified names of the bases, prefixed by their module
+     except for built-in classes.
+    """
+    if isinstance(cls, StaticObject):
+        return list(cls.bases)
+
+    bases = []
+    for base in getattr(cls, '__bases__', ()):
+        if base.__module__ == 'builtins':
+            bases.append(base.__qualname__)
+            continue
+        bases.append('{}.{}'.format(base.__module__, base.__qualname__))
+    return bases
+
+
+class StaticObject(object):
+    """
+    Stand-in for a public object of a module that was not imported in the
+    current process.
+
+    Instances expose the standard ``__name__``, ``__qualname__``,
+    ``__module__`` and ``__doc__`` attributes so they can be handled by the
+    templates and filters in the same way as the real objects. The first line
+    of the docstring is precomputed in the ``summary`` attribute.
+
+    :param str name: Name of the object.
+    :param str module: Name of the module defining the object.
+    :param str kind: One of ``function``, ``class``, ``exception`` or
+     ``variable``.
+    :param str doc: Docstring of the object, if any.
+    :param list bases: Names of the bases of the class, if a class.
+    :param str value: Representation of the object value.
+    :param str qualname: Qualified name of the object. If None, the default,
+     the ``name`` is used.
+    """
+
+    def __init__(
+            self, name, module, kind,
+            doc=None, bases=(), value=None, qualname=None):
+        self.__name__ = name
+        self.__qualname__ = qualname or name
+        self.__module__ = module
+        self.__doc__ = doc
+        self.summary = None
+        if doc is not None:
+            self.summary = cleandoc(doc).split('\n').pop(0)
+        self.kind = kind
+        self.bases = list(bases)
+        self.value = value
+
+    @classmethod
+    def from_object(cls, name, obj, category):
+        """
+        Create a stand-in for a loaded object.
+
+        :param str name: Name of the object in the public API.
+        :param obj: The object.
+        :param str category: Public API category of the object.
+
+        :rtype: :class:`StaticObject`
+        :return: A new instance describing the object.
+        """
+        kind = {
+            category: kind for kind, category in CATEGORIES.items()
+        }[category]
+
+        # Values are represented with the default limits, as the limits of
+        # the documentation aren't known when inspecting
+        if kind == 'variable':
+            return cls(name, None, kind, value=render_value(obj))
+
+        bases = []
+        if kind in ('class', 'exception'):
+            bases = base_names(obj)
+
+        return cls(
+            getattr(obj, '__name__', name),
+            getattr(obj, '__module__', None),
+            kind,
+            doc=getdoc(obj),
+            bases=bases,
+            qualname=getattr(obj, '__qualname__', None),
+        )
+
+    def __getstate__(self):
+        # A plain tuple is much faster to send to other processes
+        return (
+            self.__name__, self.__qualname__, self.__module__, self.__doc__,
+            self.summary, self.kind, self.bases, self.value,
+        )
+
+    def __setstate__(self, state):
+        (
+            self.__name__, self.__qualname__, self.__module__, self.__doc__,
+            self.summary, self.kind, self.bases, self.value,
+        ) = state
+
+    def __repr__(self):
+        if self.value is not None:
+            return self.value
+        return '<{} {}.{}>'.format(
+            self.kind, self.__module__, self.__qualname__
+        )
+
+
+# Marker of the objects that cannot be determined statically
+_UNKNOWN = object()
+
+
+def find_spec(name):
+    """
+    Find the module specification of a module without importing it.
+
+    Unlike :py:func:`importlib.util.find_spec`, the parent packages of
+    submodules are not imported. Their search locations are used instead.
+
+    Modules are looked up in the :py:data:`sys.path` first, and then with the
+    other finders in :py:data:`sys.meta_path`, like the ones installed by
+    editable installs.
+
+    :param str name: Name of the module in "dot notation".
+
+    :rtype: :py:class:`importlib.machinery.ModuleSpec` or None
+    :return: The specification of the module, or None if not found.
+    """
+    parts = name.split('.')
+    path = None
+    spec = None
+
+    for index in range(len(parts)):
+        if index and path is None:
+            return None
+        spec = _find_spec('.'.join(parts[:index + 1]), path)
+        if spec is None:
+            return None
+        path = spec.submodule_search_locations
+
+    return spec
+
+
+def _find_spec(name, path):
+    """
+    Find the module specification of a module with the path finder, or else
+    with the other meta path finders.
+    """
+    spec = PathFinder.find_spec(name, path)
+    if spec is not None:
+        return spec
+
+    for finder in sys.meta_path:
+        if finder is PathFinder or not hasattr(finder, 'find_spec'):
+            continue
+        try:
+            spec = finder.find_spec(name, path)
+        except Exception:
+            continue
+        if spec is not None:
+            return spec
+    return None
+
+
+def _is_source(spec):
+    """
+    Check if the given module specification points to Python source code.
+    """
+    origin = spec.origin
+    return bool(origin) and any(
+        origin.endswith(suffix) for suffix in SOURCE_SUFFIXES
+    )
+
+
+def _resolve_relative(module, ispkg, level, target):
+    """
+    Resolve the absolute module name of a ``from`` import.
+    """
+    if not level:
+        return target
+
+    parts = module.split('.')
+    if not ispkg:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[:-(level - 1)]
+    if target:
+        parts.append(target)
+    return '.'.join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _parse(origin, mtime, size):
+    """
+    Parse a source file. Cached by file location, modification time and size.
+    """
+    with open(origin, 'rb') as fd:
+        source = fd.read()
+    return source, ast.parse(source, origin)
+
+
+def _dotted(node):
+    """
+    Get the dotted name of a name or attribute expression, like a base class.
+
+    Subscripted names, like ``Generic[T]``, are reduced to the name.
+
+    :return: The dotted name, or None if the expression isn't a name.
+    """
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = _dotted(node.value)
+        if value is not None:
+            return '{}.{}'.format(value, node.attr)
+    return None
+
+
+def _is_literal(node):
+    """
+    Check if an expression is a literal value.
+    """
+    try:
+        ast.literal_eval(node)
+    except Exception:
+        return False
+    return True
+
+
+def _toplevel(body):
+    """
+    Iterate the top-level statements of a module, including the ones nested
+    in ``if``, ``try`` and ``with`` blocks.
+    """
+    for statement in body:
+        yield statement
+
+        if not isinstance(statement, (ast.If, ast.Try, ast.With)):
+            continue
+
+        blocks = [
+            getattr(statement, field, [])
+            for field in ('body', 'orelse', 'finalbody')
+        ]
+        blocks.extend(
+            handler.body for handler in getattr(statement, 'handlers', [])
+        )
+        for block in blocks:
+            for substatement in _toplevel(block):
+                yield substatement
+
+
+class _Module(object):
+    """
+    Result of the analysis of the source of a single module.
+    """
+
+    def __init__(self, name, ispkg, source, tree):
+        self.name = name
+        self.ispkg = ispkg
+        self.source = source
+        self.definitions = {}
+        self.listings = {}
+        self.dynamic = set()
+        self.imports = []
+        self.uncertain = set()
+
+        for statement in _toplevel(tree.body):
+            self._visit(statement)
+
+    def _define(self, name, kind, node):
+        """
+        Register the definition of a name.
+
+        Names defined more than once, like the fallbacks of optional imports,
+        are uncertain, as the definition that prevails depends on the flow of
+        the module when imported.
+        """
+        previous = self.definitions.get(name)
+        if previous is not None and previous != (kind, node):
+            self.uncertain.add(name)
+        self.definitions[name] = (kind, node)
+
+    def _visit(self, statement):
+        if isinstance(
+                statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self._define(statement.name, 'function', statement)
+            # Decorators can replace the function with any other object
+            if statement.decorator_list:
+                self.uncertain.add(statement.name)
+            return
+
+        if isinstance(statement, ast.ClassDef):
+            self._define(statement.name, 'class', statement)
+            if statement.decorator_list:
+                self.uncertain.add(statement.name)
+            return
+
+        if isinstance(statement, ast.Import):
+            for alias in statement.names:
+                self.imports.append(alias.name)
+                if alias.asname:
+                    self._define(alias.asname, 'module', alias.name)
+                else:
+                    top = alias.name.split('.')[0]
+                    self._define(top, 'module', top)
+            return
+
+        if isinstance(statement, ast.ImportFrom):
+            target = _resolve_relative(
+                self.name, self.ispkg, statement.level, statement.module
+            )
+            self.imports.append(target)
+            for alias in statement.names:
+                # Star imports can override any name defined before them
+                if alias.name == '*':
+                    self.uncertain.update(self.definitions)
+                    continue
+                self.imports.append('{}.{}'.format(target, alias.name))
+                self._define(
+                    alias.asname or alias.name, 'import', (target, alias.name)
+                )
+            return
+
+        if isinstance(statement, (ast.Assign, ast.AnnAssign)):
+            # Annotations without value doesn't define anything
+            if statement.value is None:
+                return
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            else:
+                targets = [statement.target]
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id in ('__api__', '__all__'):
+                    self.listings[target.id] = statement.value
+                    continue
+                self._define(target.id, 'variable', statement.value)
+            return
+
+        if isinstance(statement, ast.AugAssign):
+            if isinstance(statement.target, ast.Name):
+                self.dynamic.add(statement.target.id)
+            return
+
+        # Listings modified by calls, like __all__.extend(...)
+        if isinstance(statement, ast.Expr) and \
+                isinstance(statement.value, ast.Call):
+            func = statement.value.func
+            if isinstance(func, ast.Attribute) and \
+                    isinstance(func.value, ast.Name):
+                self.dynamic.add(func.value.id)
+
+    def listing(self):
+        """
+        Get the public listing of the module.
+
+        :rtype: list or None
+        :return: The list of public names, an empty list if no listing exists
+         or None if the listing cannot be determined statically.
+        """
+        for key in ['__api__', '__all__']:
+            if key in self.dynamic:
+                return None
+
+            if key not in self.listings:
+                if key in self.definitions:
+                    return None
+                continue
+
+            try:
+                names = ast.literal_eval(self.listings[key])
+            except ValueError:
+                return None
+
+            if not isinstance(names, (list, tuple)) or \
+                    not all(isinstance(name, str) for name in names):
+                return None
+            return list(names)
+
+        return []
+
+
+class StaticAnalyzer(object):
+    """
+    Analyzer of the public API of modules from their source code.
+
+    The analyzer keeps a cache of the modules it parsed, so a single instance
+    should be used for the whole tree.
+    """
+
+    def __init__(self):
+        self._modules = {}
+
+    def _module(self, name):
+        """
+        Get the analysis of a module, or None if it has no source code.
+        """
+        if name in self._modules:
+            return self._modules[name]
+
+        self._modules[name] = None
+        spec = find_spec(name)
+
+        if spec is not None and spec.origin and _is_source(spec):
+            info = stat(spec.origin)
+            source, tree = _parse(spec.origin, info.st_mtime_ns, info.st_size)
+            self._modules[name] = _Module(
+                name, spec.submodule_search_locations is not None,
+                source, tree
+            )
+
+        return self._modules[name]
+
+    def _lookup(self, module, name, seen):
+        """
+        Find the definition of a name in a module, following imports.
+
+        :return: A tuple ``(module, kind, node)`` or None if not found.
+        """
+        key = (module.name, name)
+        if key in seen:
+            return None
+        seen.add(key)
+
+        if name in module.uncertain:
+            return None
+
+        if name not in module.definitions:
+            # Submodules are available as attributes of packages
+            if module.ispkg and find_spec(
+                    '{}.{}'.format(module.name, name)) is not None:
+                return (module, 'module', '{}.{}'.format(module.name, name))
+            return None
+
+        kind, node = module.definitions[name]
+        if kind != 'import':
+            return (module, kind, node)
+
+        target, attribute = node
+        submodule = '{}.{}'.format(target, attribute)
+        source = self._module(target)
+
+        if source is not None:
+            found = self._lookup(source, attribute, seen)
+            if found is not None:
+                return found
+
+        if find_spec(submodule) is not None:
+            return (module, 'module', submodule)
+        return None
+
+    def _base(self, module, base):
+        """
+        Find the definition of a base of a class.
+
+        :return: A tuple ``(module, kind, node)``, a built-in class, or None if
+         not found.
+        """
+        dotted = _dotted(base)
+        if dotted is None:
+            return None
+
+        parts = dotted.split('.')
+        if parts[0] not in module.definitions:
+            builtin = getattr(builtins, parts[0], None)
+            if len(parts) == 1 and isinstance(builtin, type):
+                return builtin
+            return None
+
+        found = self._find(module, parts[0], set())
+        for attribute in parts[1:]:
+            if found is None or found[1] != 'module':
+                return None
+            submodule = self._module(found[2])
+            if submodule is None:
+                return None
+            found = self._find(submodule, attribute, set())
+        return found
+
+    def _is_exception(self, module, classdef, seen):
+        """
+        Check if a class definition is an exception.
+        """
+        for base in classdef.bases:
+            found = self._base(module, base)
+
+            if isinstance(found, type):
+                if issubclass(found, Exception):
+                    return True
+                continue
+
+            if found is not None and found[1] == 'class':
+                key = (found[0].name, found[2].name)
+                if key not in seen:
+                    seen.add(key)
+                    if self._is_exception(found[0], found[2], seen):
+                        return True
+                continue
+
+            dotted = _dotted(base)
+            if found is None and dotted is not None and \
+                    dotted.endswith(('Error', 'Exception')):
+                return True
+
+        return False
+
+    def _docstring(self, module, classdef, seen):
+        """
+        Get the docstring of a class definition, inherited from its bases if
+        it has none, like :py:func:`inspect.getdoc` does.
+
+        :return: The docstring, None if no class has one, or :data:`_UNKNOWN`
+         if a base cannot be found statically.
+        """
+        doc = ast.get_docstring(classdef, clean=False)
+        if doc is not None:
+            return doc
+
+        for base in classdef.bases:
+            found = self._base(module, base)
+
+            if isinstance(found, type):
+                # The docstring of object is never inherited
+                if found is not object:
+                    doc = getdoc(found)
+
+            elif found is not None and found[1] == 'class':
+                key = (found[0].name, found[2].name)
+                if key in seen:
+                    continue
+                seen.add(key)
+                doc = self._docstring(found[0], found[2], seen)
+
+            else:
+                return _UNKNOWN
+
+            if doc is not None:
+                return doc
+
+        return None
+
+    def _object(self, module, name, found, seen=None):
+        """
+        Create the object for a public element found statically.
+
+        :return: The object, or :data:`_UNKNOWN` if it cannot be determined
+         statically.
+        """
+        owner, kind, node = found
+
+        if kind == 'function':
+            return StaticObject(
+                node.name, owner.name, 'function',
+                doc=ast.get_docstring(node, clean=False),
+            )
+
+        if kind == 'class':
+            doc = self._docstring(owner, node, set())
+            if doc is _UNKNOWN:
+                return _UNKNOWN
+            return StaticObject(
+                node.name, owner.name,
+                'exception' if self._is_exception(owner, node, set())
+                else 'class',
+                doc=doc,
+                bases=[
+                    dotted for dotted in map(_dotted, node.bases)
+                    if dotted is not None
+                ],
+            )
+
+        if kind == 'module':
+            return StaticObject(
+                node, node, 'variable', value='<module \'{}\'>'.format(node)
+            )
+
+        # Variables
+        if isinstance(node, ast.Lambda):
+            return StaticObject(name, owner.name, 'function')
+
+        # Aliases of other names, like OldName = Name
+        if isinstance(node, ast.Name):
+            if seen is None:
+                seen = set()
+            key = (owner.name, node.id)
+            if key in seen:
+                return _UNKNOWN
+            seen.add(key)
+
+            aliased = self._lookup(owner, node.id, set())
+            if aliased is None:
+                return _UNKNOWN
+            return self._object(owner, node.id, aliased, seen)
+
+        # Any other expression than a literal requires to import the module
+        try:
+            return ast.literal_eval(node)
+        except Exception:
+            return _UNKNOWN
+
+    def _find(self, module, name, seen):
+        """
+        Find the definition of a name in a module, following imports and
+        aliases of other names.
+
+        :return: A tuple ``(module, kind, node)`` or None if not found.
+        """
+        found = self._lookup(module, name, seen)
+        while found is not None and found[1] == 'variable' and \
+                isinstance(found[2], ast.Name):
+            found = self._lookup(found[0], found[2].id, seen)
+        return found
+
+    def origins(self, name, names):
+        """
+        Find the modules defining some public objects of a module, following
+        its imports.
+
+        :param str name: Name of the module in "dot notation".
+        :param names: Public names of the module to find.
+
+        :rtype: dict
+        :return: A mapping between the names found and the name of the
+         module defining them.
+        """
+        module = self._module(name)
+        if module is None:
+            return {}
+
+        origins = {}
+        for obj_name in names:
+            found = self._find(module, obj_name, set())
+            if found is not None:
+                origins[obj_name] = found[0].name
+        return origins
+
+    def dependencies(self, name, names):
+        """
+        Find the other modules whose source determines some public objects of
+        a module.
+
+        :param str name: Name of the module in "dot notation".
+        :param names: Public names of the module to find.
+
+        :rtype: set
+        :return: The names of the modules followed to find the objects,
+         other than the module itself. If any of them cannot be found, or is
+         a variable computed from other objects, all the modules imported by
+         the module defining it are included too, as any of them could be
+         the origin of its value.
+        """
+        module = self._module(name)
+        if module is None:
+            return set()
+
+        modules = set()
+        for obj_name in names:
+            seen = set()
+            found = self._find(module, obj_name, seen)
+            modules.update(key[0] for key in seen)
+
+            if found is None:
+                modules.update(module.imports)
+            elif found[1] == 'variable' and not _is_literal(found[2]):
+                modules.update(found[0].imports)
+
+        modules.discard(name)
+        return modules
+
+    def analyze(self, name):
+        """
+        Analyze the public API of a module.
+
+        :param str name: Name of the module in "dot notation".
+
+        :rtype: :py:class:`OrderedDict` or None
+        :return: An ordered mapping between the public names and a tuple
+         ``(category, object)``, where category is one of ``functions``,
+         ``classes``, ``exceptions`` or ``variables``. None if the module
+         needs to be imported to determine its public API.
+        """
+        spec = find_spec(name)
+        if spec is None:
+            return None
+
+        # Namespace packages have no source and no public API
+        if spec.origin in (None, 'namespace') and \
+                spec.submodule_search_locations is not None:
+            return OrderedDict()
+
+        module = self._module(name)
+        if module is None:
+            return None
+
+        names = module.listing()
+        if names is None:
+            return None
+
+        public = OrderedDict()
+        for obj_name in names:
+            found = self._lookup(module, obj_name, set())
+            if found is None:
+                return None
+
+            obj = self._object(module, obj_name, found)
+            if obj is _UNKNOWN:
+                return None
+
+            kind = 'variable'
+            if isinstance(obj, StaticObject):
+                kind = obj.kind
+            category = CATEGORIES[kind]
+            public[obj_name] = (category, obj)
+
+        return public
+
+
+__all__ = [
+    'CATEGORIES', 'StaticObject', 'StaticAnalyzer', 'base_names', 'find_spec',
+]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Memoized documentation summaries of public objects.
+
+The same objects are commonly re-exported by several modules of a package, so
+their summaries are computed once per object identity and reused by all the
+pages that list them.
+
+Summaries of :class:`autoapi.static.StaticObject` are computed when the
+stand-in is created, and travel with it to the parent process and to the
+persistent cache. Summaries of loaded objects are memoized by a
+:class:`SummaryCache`, that holds weak references to the objects that
+support them, and a bounded number of strong references to the ones that
+don't. The same memoization by identity is available for any other function
+of the objects with :class:`IdentityCache`.
+"""
+
+from weakref import ref
+from threading import Lock
+from inspect import getdoc
+from collections import OrderedDict
+
+from .static import StaticObject
+
+
+def summarize(obj):
+    """
+    Get the first line of the docstring of an object.
+
+    :param obj: The object to summarize.
+
+    :rtype: str or None
+    :return: The summary of the object, or None if undocumented.
+    """
+    if isinstance(obj, StaticObject):
+        return obj.summary
+
+    doc = getdoc(obj)
+    if doc is None:
+        return None
+    return doc.split('\n').pop(0)
+
+
+class IdentityCache(object):
+    """
+    Cache of the results of a function of objects by identity.
+
+    :param function: Function of an object to memoize.
+    :param int size: Maximum number of results of objects that can't be
+     weakly referenced to keep.
+    """
+
+    def __init__(self, function, size=1024):
+        self.function = function
+        self.size = size
+        self._weak = {}
+        self._strong = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, obj):
+        """
+        Get the result of the function for an object, computing it only the
+        first time.
+
+        :param obj: The object.
+
+        :return: The result of the function.
+        """
+        key = id(obj)
+
+        entry = self._weak.get(key)
+        if entry is not None and entry[0]() is obj:
+            return entry[1]
+
+        with self._lock:
+            entry = self._strong.get(key)
+            if entry is not None and entry[0] is obj:
+                self._strong.move_to_end(key)
+                return entry[1]
+
+        result = self.function(obj)
+
+        try:
+            self._weak[key] = (ref(obj, self._discard(key)), result)
+            return result
+        except TypeError:
+            pass
+
+        with self._lock:
+            self._strong[key] = (obj, result)
+            if len(self._strong) > self.size:
+                self._strong.popitem(last=False)
+        return result
+
+    def _discard(self, key):
+        """
+        Create the callback that removes a collected object.
+        """
+        def callback(reference):
+            entry = self._weak.get(key)
+            if entry is not None and entry[0] is reference:
+                del self._weak[key]
+        return callback
+
+    def clear(self):
+        """
+        Remove all the results.
+        """
+        with self._lock:
+            self._weak.clear()
+            self._strong.clear()
+
+
+class SummaryCache(IdentityCache):
+    """
+    Cache of the summaries of objects by identity. See :func:`summarize`.
+
+    :param int size: Maximum number of summaries of objects that can't be
+     weakly referenced to keep.
+    """
+
+    def __init__(self, size=1024):
+        super(SummaryCache, self).__init__(summarize, size=size)
+
+
+__all__ = ['summarize', 'IdentityCache', 'SummaryCache']
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Bounded pretty representation of the values of public variables.
+
+The representation follows the layout of :py:func:`pprint.pformat` for
+dictionaries, lists, tuples and sets, but stops traversing the value as soon as
+any of the limits is reached. Subclasses of those with their own
+representation, like :py:class:`collections.OrderedDict` or
+:py:class:`collections.Counter`, are traversed in the same way and shown as
+``TypeName({...})``. Other objects are represented with :py:mod:`reprlib`
+bounded by the same limits, and integers too large to be converted to decimal
+are shown in hexadecimal:
+
+- ``chars``: Maximum number of characters of the representation.
+- ``items``: Maximum number of items shown of each container.
+- ``depth``: Maximum nesting level of containers shown.
+
+Elided parts are shown as ``...``. As :py:mod:`pprint` sorts the elements of
+dictionaries and sets, only the smallest elements that will be shown are
+taken from them, in a single pass.
+"""
+from heapq import nsmallest
+from reprlib import Repr
+from itertools import islice
+
+
+# Default limits of the representation
+CHARS = 2000
+ITEMS = 100
+DEPTH = 5
+
+
+class _Repr(Repr):
+    """
+    Bounded representation of the objects not traversed by the renderer.
+
+    Objects unknown to :py:mod:`reprlib` keep their whole representation, to
+    be truncated at the end as any other text.
+    """
+
+    def repr_instance(self, obj, level):
+        return repr(obj)
+
+    def repr_int(self, obj, level):
+        try:
+            return super(_Repr, self).repr_int(obj, level)
+        except ValueError:
+            # Too many digits to be converted to decimal, see
+            # sys.set_int_max_str_digits
+            text = hex(obj)
+            if len(text) > self.maxlong:
+                text = text[:self.maxlong] + '...'
+            return text
+
+
+class _Truncated(Exception):
+    """
+    Raised when the maximum number of characters is reached.
+    """
+
+
+def _first(elements, items):
+    """
+    Get the first ``items`` elements and one more, in the order of
+    :py:mod:`pprint` if they can be sorted, or else in iteration order.
+
+    Only the elements taken are sorted, instead of all of them.
+    """
+    try:
+        return nsmallest(items + 1, elements)
+    except TypeError:
+        return list(islice(elements, items + 1))
+
+
+def _container(obj, items):
+    """
+    Get the layout of a container.
+
+    Subclasses with their own representation are shown as the type name
+    wrapping the representation of the base, keeping the order of their
+    elements, of which only the first ``items`` and one more are taken. Named
+    tuples are not considered containers.
+
+    :return: A tuple ``(open, close, elements, mapping)`` or None if the object
+     is not a container.
+    """
+    typ = type(obj)
+    representation = typ.__repr__
+
+    if issubclass(typ, dict):
+        if not obj:
+            return None
+        if representation is not dict.__repr__:
+            return (
+                '{}({{'.format(typ.__name__), '})',
+                list(islice(obj.items(), items + 1)), True,
+            )
+        keys = _first(obj, items)
+        return '{', '}', [(key, obj[key]) for key in keys], True
+
+    if issubclass(typ, list):
+        if representation is list.__repr__:
+            return '[', ']', obj, False
+        if obj:
+            return '{}(['.format(typ.__name__), '])', obj, False
+        return None
+
+    if issubclass(typ, tuple):
+        if representation is tuple.__repr__:
+            return '(', ')', obj, False
+        if obj and not hasattr(typ, '_fields'):
+            return '{}(('.format(typ.__name__), '))', obj, False
+        return None
+
+    if not obj:
+        return None
+
+    if issubclass(typ, set) and representation is set.__repr__:
+        return '{', '}', _first(obj, items), False
+
+    if issubclass(typ, frozenset) and representation is frozenset.__repr__:
+        return 'frozenset({', '})', _first(obj, items), False
+
+    if issubclass(typ, (set, frozenset)):
+        return (
+            '{}({{'.format(typ.__name__), '})',
+            list(islice(obj, items + 1)), False,
+        )
+
+    return None
+
+
+class _Renderer(object):
+    """
+    Writer of the bounded representation of a value.
+    """
+
+    def __init__(self, chars, items, depth, width):
+        self.chars = chars
+        self.items = items
+        self.depth = depth
+        self.width = width
+        self.pieces = []
+        self.written = 0
+
+        self.repr = _Repr()
+        self.repr.maxlevel = depth
+        self.repr.maxstring = chars
+        self.repr.maxlong = chars
+        self.repr.maxother = chars
+        for limit in ('maxtuple', 'maxlist', 'maxarray', 'maxdict', 'maxset',
+                      'maxfrozenset', 'maxdeque'):
+            setattr(self.repr, limit, items)
+
+    def write(self, text):
+        remaining = self.chars - self.written
+        if len(text) > remaining:
+            self.pieces.append(text[:remaining])
+            raise _Truncated()
+        self.pieces.append(text)
+        self.written += len(text)
+
+    def scalar(self, obj):
+        if isinstance(obj, (str, bytes)):
+            if len(obj) > self.chars:
+                return repr(obj[:self.chars]) + '...'
+            return repr(obj)
+        return self.repr.repr(obj)
+
+    def flat(self, obj, level):
+        """
+        Iterate the pieces of the single line representation of a value.
+        """
+        layout = _container(obj, self.items)
+        if layout is None:
+            yield self.scalar(obj)
+            return
+
+        opening, closing, elements, mapping = layout
+        if not elements:
+            yield repr(obj)
+            return
+        if level >= self.depth:
+            yield opening + '...' + closing
+            return
+
+        yield opening
+        for index, element in enumerate(elements):
+            if index:
+                yield ', '
+            if index >= self.items:
+                yield '...'
+                break
+            if mapping:
+                yield from self.flat(element[0], level + 1)
+                yield ': '
+                yield from self.flat(element[1], level + 1)
+            else:
+                yield from self.flat(element, level + 1)
+        if opening.endswith('(') and len(elements) == 1:
+            yield ','
+        yield closing
+
+    def fits(self, obj, level, limit):
+        """
+        Get the single line representation of a value if it fits the limit.
+        """
+        pieces = []
+        size = 0
+        for piece in self.flat(obj, level):
+            size += len(piece)
+            if size > limit:
+                return None
+            pieces.append(piece)
+        return ''.join(pieces)
+
+    def format(self, obj, indent, level):
+        """
+        Write the representation of a value at the given indentation.
+        """
+        line = self.fits(obj, level, self.width - indent)
+        if line is not None:
+            self.write(line)
+            return
+
+        layout = _container(obj, self.items)
+        if layout is None:
+            self.write(self.scalar(obj))
+            return
+
+        opening, closing, elements, mapping = layout
+        self.write(opening)
+        indent += len(opening)
+
+        for index, element in enumerate(elements):
+            if index:
+                self.write(',\n' + ' ' * indent)
+            if index >= self.items:
+                self.write('...')
+                break
+            if mapping:
+                key = ''.join(self.flat(element[0], level + 1))
+                self.write(key + ': ')
+                self.format(element[1], indent + len(key) + 2, level + 1)
+            else:
+                self.format(element, indent, level + 1)
+
+        if opening.endswith('(') and len(elements) == 1:
+            self.write(',')
+        self.write(closing)
+
+
+def render_value(obj, chars=CHARS, items=ITEMS, depth=DEPTH, width=80):
+    """
+    Get the bounded pretty representation of a value.
+
+    :param obj: The value to represent.
+    :param int chars: Maximum number of characters.
+    :param int items: Maximum number of items of each container.
+    :param int depth: Maximum nesting level of containers.
+    :param int width: Width of the lines.
+
+    :rtype: str
+    :return: The representation of the value.
+    """
+    renderer = _Renderer(chars, items, depth, width)
+    try:
+        renderer.format(obj, 0, 0)
+    except _Truncated:
+        renderer.pieces.append('...')
+    return ''.join(renderer.pieces)
+
+
+__all__ = ['CHARS', 'ITEMS', 'DEPTH', 'render_value']
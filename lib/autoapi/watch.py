@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Watch mode that regenerates the API pages of the modules that change.
+
+The pages of all modules in ``autoapi_modules`` are generated once, and the
+trees are kept in memory. Then, the source files of the modules are polled
+for changes, and only the modules that changed, along with the modules that
+export objects defined in them, are inspected again and have their pages
+rendered again. Pages are only written if their content changed.
+
+If modules are added or removed, all pages are generated again.
+
+The watch mode is started from the command line, with the source directory
+of the Sphinx project:
+
+::
+
+   autoapi-watch doc/
+
+Run ``sphinx-build`` or ``sphinx-autobuild`` in parallel to build the
+documentation from the regenerated pages.
+"""
+
+import sys
+from os import remove
+from time import sleep
+from shutil import rmtree
+from pathlib import Path
+from os.path import join
+from tempfile import mkdtemp
+from traceback import format_exc
+from argparse import ArgumentParser
+from collections import OrderedDict
+from importlib import invalidate_caches
+
+from sphinx.application import Sphinx
+from sphinx.config import eval_config_file
+from sphinx.util.tags import Tags
+from sphinx.util.logging import getLogger
+
+from .cache import APICache
+from .apinode import _discover
+from .sphinx import generate, gather_pages, render_pages, stale_pages
+
+
+log = getLogger(__name__)
+
+
+def snapshot(root):
+    """
+    Get the state of the source files of all the modules of a tree.
+
+    :param root: The root :class:`autoapi.APINode` of the tree.
+
+    :rtype: :py:class:`OrderedDict`
+    :return: A mapping between the name of each module, top-down, and the
+     location, modification time and size of its source file.
+    """
+    return OrderedDict(
+        (name, APICache.key(spec, False)[:3])
+        for name, spec in _discover(root.name, root._filter)
+    )
+
+
+def purge(name):
+    """
+    Remove a package and all its submodules from the imported modules, so
+    they are imported again from their source.
+
+    :param str name: Name of the package.
+    """
+    for key in list(sys.modules):
+        if key == name or key.startswith(name + '.'):
+            del sys.modules[key]
+    invalidate_caches()
+
+
+class Watcher(object):
+    """
+    Regenerator of the pages of the modules that changed.
+
+    :param app: The Sphinx application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.entries = []
+        self._roots = OrderedDict()
+        self._stamps = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Generate all pages again and start watching all the modules.
+        """
+        for name in self._roots:
+            purge(name)
+
+        self.entries = generate(self.app)
+        self._roots = OrderedDict()
+
+        for entry in self.entries:
+            # Trees loaded from an index, or streamed, are not watched
+            if entry['options']['index'] or entry['tree'] is None:
+                continue
+
+            root = next(iter(entry['tree'].directory.values()))
+            entry['root'] = root
+            self._roots[root.name] = root
+
+        self._stamps = {
+            name: snapshot(root) for name, root in self._roots.items()
+        }
+
+    def poll(self):
+        """
+        Check the modules for changes and regenerate the affected pages.
+
+        :rtype: list
+        :return: The path of the pages written. If modules were added or
+         removed, all pages are generated again and are not listed.
+        """
+        written = []
+
+        for name, root in self._roots.items():
+            previous = self._stamps[name]
+            stamps = snapshot(root)
+            self._stamps[name] = stamps
+
+            if list(stamps) != list(previous):
+                log.info('autoapi modules of {} changed'.format(name))
+                self.reset()
+                return written
+
+            changed = {
+                module for module, stamp in stamps.items()
+                if previous[module] != stamp
+            }
+            if changed:
+                written.extend(self.update(root, changed))
+
+        return written
+
+    def update(self, root, changed):
+        """
+        Inspect again the modules that changed and regenerate their pages, and
+        the pages of the modules that export objects defined in them.
+
+        :param root: The root :class:`autoapi.APINode` of the tree.
+        :param set changed: Names of the modules that changed.
+
+        :rtype: list
+        :return: The path of the pages written.
+        """
+        affected = set(changed)
+        for module in changed:
+            affected.update(node.name for node in root.exporters(module))
+
+        relevance = {
+            node.name: node.is_relevant() for node in root.preorder()
+        }
+
+        purge(root.name)
+        for node in root.preorder():
+            if node.name not in affected:
+                continue
+            log.info('autoapi inspecting {}'.format(node.name))
+            try:
+                node.refresh()
+            except Exception:
+                log.warning(
+                    'autoapi failed to inspect {}:\n{}'.format(
+                        node.name, format_exc()
+                    )
+                )
+
+        root.is_relevant()
+        relevance_changed = any(
+            node.is_relevant() != relevance[node.name]
+            for node in root.preorder()
+        )
+
+        written = []
+        for entry in self.entries:
+            if entry.get('root') is not root:
+                continue
+            written.extend(self._render(entry, affected, relevance_changed))
+        return written
+
+    def _render(self, entry, affected, relevance_changed):
+        """
+        Regenerate the affected pages of an entry.
+        """
+        options = entry['options']
+        nodes = entry['tree'].preorder()
+        if options['prune']:
+            nodes = [node for node in nodes if node.is_relevant()]
+
+        # With pruning, a change of relevance affects the pages listed and
+        # the submodules listed on each page
+        regenerate = options['prune'] and relevance_changed
+        if not regenerate:
+            nodes = [node for node in nodes if node.name in affected]
+
+        generated = set()
+        pages = gather_pages(
+            nodes, entry['out_dir'], entry['source_suffix'], options,
+            generated,
+        )
+
+        written = []
+        for out_file, changed in render_pages(
+                entry['template'], pages, options['jobs']):
+            if changed:
+                log.info('autoapi wrote {}'.format(out_file))
+                written.append(out_file)
+
+        if regenerate and options['override']:
+            for stale in stale_pages(
+                    entry['out_dir'], entry['module'],
+                    entry['source_suffix'], generated):
+                log.info('autoapi removing stale page {}'.format(stale))
+                remove(stale)
+
+        return written
+
+    def run(self, interval=0.5):
+        """
+        Poll the modules for changes until interrupted.
+
+        :param float interval: Time in seconds between checks.
+        """
+        while True:
+            sleep(interval)
+            self.poll()
+
+
+def create_app(srcdir, confdir=None):
+    """
+    Create a Sphinx application for the project, without generating the pages.
+
+    :param str srcdir: Source directory of the project.
+    :param str confdir: Directory of the ``conf.py`` file. If None, the
+     default, the source directory is used.
+
+    :return: A tuple ``(app, workdir)`` with the application, and the
+     temporary directory used as its output directory.
+    """
+    if confdir is None:
+        confdir = srcdir
+
+    namespace = eval_config_file(Path(confdir, 'conf.py'), Tags())
+    modules = namespace.get('autoapi_modules', {})
+
+    workdir = mkdtemp(prefix='autoapi-watch-')
+    app = Sphinx(
+        srcdir, confdir, join(workdir, 'out'), join(workdir, 'doctrees'),
+        'dummy', confoverrides={'autoapi_modules': {}},
+    )
+    app.config.autoapi_modules = modules
+    return app, workdir
+
+
+def main():
+    parser = ArgumentParser(
+        description='Regenerate the API pages of the modules that change.'
+    )
+    parser.add_argument('srcdir')
+    parser.add_argument('--confdir', default=None)
+    parser.add_argument('--interval', type=float, default=0.5)
+    args = parser.parse_args()
+
+    app, workdir = create_app(args.srcdir, args.confdir)
+    try:
+        watcher = Watcher(app)
+        log.info('autoapi watching {}'.format(', '.join(watcher._roots)))
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rmtree(workdir, ignore_errors=True)
+
+    return 0
+
+
+__all__ = ['Watcher', 'create_app']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
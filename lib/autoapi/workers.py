@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Pool of worker processes with per-task timeouts.
+
+Unlike :py:class:`concurrent.futures.ProcessPoolExecutor`, a task that takes
+too long, or that crashes or exits its worker process, only fails that task.
+The worker is killed if needed and replaced by a new one, and the remaining
+tasks continue in the pool.
+"""
+
+from time import monotonic
+from traceback import format_exc
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+
+
+class WorkerError(Exception):
+    """
+    Result of a task that failed in the worker process.
+
+    :param str reason: Description of the failure.
+    """
+
+    def __init__(self, reason):
+        super(WorkerError, self).__init__(reason)
+        self.reason = reason
+
+
+def _work(connection, initializer, initargs):
+    """
+    Main loop of a worker process.
+    """
+    if initializer is not None:
+        initializer(*initargs)
+
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        function, args = task
+        try:
+            result = function(*args)
+        except BaseException:
+            result = WorkerError(format_exc())
+        connection.send(result)
+
+
+class _Worker(object):
+    """
+    Handle of a worker process.
+    """
+
+    def __init__(self, context, initializer, initargs):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_work, args=(child, initializer, initargs), daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self.index = None
+        self.deadline = None
+
+    def submit(self, index, function, args, timeout):
+        self.index = index
+        self.deadline = None
+        if timeout is not None:
+            self.deadline = monotonic() + timeout
+        self.connection.send((function, args))
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except (OSError, EOFError):
+                pass
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool(object):
+    """
+    Pool of worker processes.
+
+    :param int jobs: Number of worker processes.
+    :param float timeout: Maximum time in seconds for each task. If None, the
+     default, tasks can take any time.
+    :param initializer: Callable to call in each new worker process.
+    :param tuple initargs: Arguments for the initializer.
+    """
+
+    def __init__(self, jobs, timeout=None, initializer=None, initargs=()):
+        self.jobs = max(1, jobs)
+        self.timeout = timeout
+        self.initializer = initializer
+        self.initargs = initargs
+        self._context = get_context()
+        self._workers = []
+
+    def _spawn(self):
+        return _Worker(self._context, self.initializer, self.initargs)
+
+    def map(self, function, *iterables):
+        """
+        Execute a function for each set of arguments in the pool.
+
+        :param function: A picklable function.
+        :param iterables: Iterables with the arguments of the function.
+
+        :return: An iterator of the results in the same order of the
+         arguments. Tasks that raised, timed out or crashed its worker
+         produce a :class:`WorkerError` as result.
+        """
+        tasks = list(zip(*iterables))
+        results = {}
+        pending = list(range(len(tasks)))
+        pending.reverse()
+        following = 0
+
+        while len(self._workers) < min(self.jobs, len(tasks)):
+            self._workers.append(self._spawn())
+
+        idle = list(self._workers)
+        busy = {}
+
+        while following < len(tasks):
+
+            # Dispatch pending tasks to idle workers
+            while pending and idle:
+                worker = idle.pop()
+                index = pending.pop()
+                worker.submit(index, function, tasks[index], self.timeout)
+                busy[worker.connection] = worker
+
+            # Wait for the next result or the next deadline
+            deadlines = [
+                worker.deadline for worker in busy.values()
+                if worker.deadline is not None
+            ]
+            waittime = None
+            if deadlines:
+                waittime = max(0, min(deadlines) - monotonic())
+
+            for connection in wait(list(busy), waittime):
+                worker = busy.pop(connection)
+                try:
+                    results[worker.index] = connection.recv()
+                    worker.index = None
+                    idle.append(worker)
+                except (EOFError, OSError):
+                    worker.process.join()
+                    results[worker.index] = WorkerError(
+                        'Worker process crashed with exit code {}'.format(
+                            worker.process.exitcode
+                        )
+                    )
+                    idle.append(self._replace(worker))
+
+            # Kill the workers of tasks that timed out
+            now = monotonic()
+            for connection, worker in list(busy.items()):
+                if worker.deadline is not None and worker.deadline <= now:
+                    del busy[connection]
+                    results[worker.index] = WorkerError(
+                        'Timed out after {} seconds'.format(self.timeout)
+                    )
+                    idle.append(self._replace(worker, kill=True))
+
+            # Yield results in order
+            while following in results:
+                yield results.pop(following)
+                following += 1
+
+    def _replace(self, worker, kill=False):
+        """
+        Stop a worker and start a new one in its place.
+        """
+        worker.stop(kill=kill)
+        replacement = self._spawn()
+        self._workers[self._workers.index(worker)] = replacement
+        return replacement
+
+    def close(self):
+        """
+        Stop all worker processes.
+
+        Workers still running a task, like when :meth:`map` is abandoned, are
+        killed, as they could be blocked sending their result and never read
+        the request to stop.
+        """
+        for worker in self._workers:
+            worker.stop(kill=worker.index is not None)
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+__all__ = ['WorkerError', 'WorkerPool']
@@ -67,6 +67,13 @@ setup(
     # Dependencies
     install_requires=find_requirements('requirements.txt'),
 
+    # Entry points
+    entry_points={
+        'console_scripts': [
+            'autoapi-watch = autoapi.watch:main',
+        ],
+    },
+
     # Metadata
     author='KuraLabs S.R.L',
     author_email='info@kuralabs.io',
@@ -34,7 +34,7 @@ def test_autotree():
 
     assert tree.is_root()
     assert tree.depth() == 1
-    assert len(tree.directory) == 3
+    assert len(tree.directory) == 13
     assert tree.is_relevant()
     assert tree.has_public_api()
     assert tree.get_module('autoapi.apinode') is not None
@@ -51,4 +51,229 @@ def test_autotree():
         for leaf in leaves:
             assert leaf.is_leaf()
             assert leaf.depth() == depth + 1
+            assert leaf.parent is node
+            assert not leaf.is_root()
         depth += 1
+
+    assert tree.parent is None
+    assert not hasattr(tree, '__dict__')
+
+    assert tree.sources() == {'APINode': 'autoapi.apinode'}
+    assert tree.dependencies() == {'autoapi.apinode'}
+    assert tree.exporters('autoapi.apinode') == [tree]
+    assert tree.exporters('autoapi') == []
+
+
+def test_build_parallel():
+    """
+    Check that the tree built in parallel matches the serial one.
+    """
+    serial = APINode('autoapi')
+    parallel = APINode.build('autoapi', jobs=2)
+
+    assert list(parallel.directory) == list(serial.directory)
+    assert parallel.is_root()
+    assert parallel.tree() == serial.tree()
+
+    for name, node in serial.directory.items():
+        other = parallel.get_module(name)
+        assert [n.name for n in other.subnodes] == \
+            [n.name for n in node.subnodes]
+        assert other.is_relevant() == node.is_relevant()
+        for category, elements in node.api.items():
+            assert list(other.api[category]) == list(elements)
+
+    isolated = APINode.build('autoapi', timeout=60)
+    assert isolated.tree() == serial.tree()
+
+
+def test_lazy():
+    """
+    Check that lazy trees are only expanded as needed.
+    """
+    tree = APINode('autoapi', lazy=True)
+
+    assert tree.is_root()
+    assert list(tree._directory) == ['autoapi']
+
+    node = tree.get_module('autoapi.apinode')
+    assert node is not None
+    assert not node._loaded
+    assert tree.get_module('autoapi.missing') is None
+
+    assert list(node.classes) == []
+    assert node._loaded
+    assert not node.is_relevant()
+
+    eager = APINode('autoapi')
+    assert list(tree.directory) == list(eager.directory)
+    assert tree.tree() == eager.tree()
+
+
+def test_light(tmpdir):
+    """
+    Check that light trees only keep lightweight records of the objects, and
+    that the modules imported to build them can be released.
+    """
+    from sys import modules, path
+    from autoapi.static import StaticObject
+
+    eager = APINode('autoapi')
+    light = APINode('autoapi', light=True)
+
+    assert light.tree() == eager.tree()
+    for name, node in light.directory.items():
+        assert node.module is None
+        for category, elements in node.api.items():
+            assert list(elements) == \
+                list(eager.get_module(name).api[category])
+            for obj in elements.values():
+                assert isinstance(obj, StaticObject)
+                assert obj.__doc__ is None
+
+    package = tmpdir.mkdir('lightpkg')
+    package.join('__init__.py').write('"""Package."""\n')
+    package.join('sub.py').write(
+        '__all__ = [\'function\']\n'
+        'def function():\n'
+        '    """Summary."""\n'
+    )
+
+    path.insert(0, str(tmpdir))
+    try:
+        tree = APINode.build('lightpkg', light=True, restore=True)
+    finally:
+        path.remove(str(tmpdir))
+
+    assert 'lightpkg' not in modules
+    assert 'lightpkg.sub' not in modules
+    function = tree.get_module('lightpkg.sub').functions['function']
+    assert function.summary == 'Summary.'
+
+
+def test_light_restore(tmpdir, monkeypatch):
+    """
+    Check that the modules imported to build a light tree are released even if
+    the package was imported before, as a Sphinx configuration usually does.
+    """
+    from gc import collect
+    from sys import modules
+    from importlib import import_module
+
+    tmpdir.join('tracked.py').write('refs = []\n')
+    package = tmpdir.mkdir('preimported')
+    package.join('__init__.py').write('__version__ = \'1.0\'\n')
+    for index in range(3):
+        package.join('sub{}.py'.format(index)).write(
+            'import sys, tracked, weakref\n'
+            '__all__ = [\'data\']\n'
+            'data = list(range(1000))\n'
+            'tracked.refs.append(weakref.ref(sys.modules[__name__]))\n'
+        )
+
+    monkeypatch.syspath_prepend(str(tmpdir))
+    tracked = import_module('tracked')
+    root = import_module('preimported')
+
+    tree = APINode.build('preimported', light=True, restore=True)
+    collect()
+
+    assert len(tree.directory) == 4
+    assert len(tracked.refs) == 3
+    assert not any(ref() is not None for ref in tracked.refs)
+    assert not any(name.startswith('preimported.') for name in modules)
+    assert not hasattr(root, 'sub0')
+
+
+def test_stream():
+    """
+    Check that streamed nodes are yielded after all their submodules.
+    """
+    tree = APINode('autoapi')
+    nodes = list(APINode.stream('autoapi'))
+
+    assert sorted(node.name for node in nodes) == sorted(tree.directory)
+    assert nodes[-1].name == 'autoapi'
+
+    seen = set()
+    for node in nodes:
+        assert node.module is None
+        assert node.parent is None
+        assert {subnode.name for subnode in node.subnodes} <= seen
+        assert node.is_relevant() == tree.get_module(node.name).is_relevant()
+        seen.add(node.name)
+
+
+def test_stream_restore(tmpdir, monkeypatch):
+    """
+    Check that streaming with restore keeps the modules alive flat as the
+    package grows, even if the package was imported before.
+    """
+    from gc import collect
+    from sys import modules
+    from importlib import import_module
+
+    tmpdir.join('tracked.py').write('refs = []\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+    tracked = import_module('tracked')
+
+    def peak(name, size):
+        package = tmpdir.mkdir(name)
+        package.join('__init__.py').write('')
+        for index in range(size):
+            subpackage = package.mkdir('sub{}'.format(index))
+            subpackage.join('__init__.py').write('')
+            for subindex in range(size):
+                subpackage.join('mod{}.py'.format(subindex)).write(
+                    'import sys, tracked, weakref\n'
+                    '__all__ = [\'data\']\n'
+                    'data = list(range(1000))\n'
+                    'tracked.refs.append(weakref.ref(sys.modules[__name__]))\n'
+                )
+
+        import_module(name)
+        baseline = set(modules)
+        del tracked.refs[:]
+        alive = 0
+        for node in APINode.stream(name, restore=True):
+            collect()
+            alive = max(alive, sum(ref() is not None for ref in tracked.refs))
+        collect()
+        assert not set(modules) - baseline
+        assert not any(ref() is not None for ref in tracked.refs)
+        assert len(tracked.refs) == size * size
+        return alive
+
+    assert peak('streamsmall', 2) == peak('streamlarge', 8) == 1
+
+
+def test_lookup():
+    """
+    Check the inverted index of the public objects of the tree.
+    """
+    from autoapi.summary import summarize
+
+    tree = APINode('autoapi')
+    summary = tree.get_module('autoapi.summary')
+    apinode = tree.get_module('autoapi.apinode')
+
+    assert tree.lookup_name('APINode') == [(tree, 'classes')]
+    assert apinode.lookup_object(APINode) == [(tree, 'classes')]
+    assert tree.lookup_object(object()) == []
+    assert tree.lookup_qualname('autoapi.summary.summarize') == \
+        [(summary, 'functions')]
+    assert tree.lookup_name('CHARS') == \
+        tree.lookup_qualname('autoapi.values.CHARS')
+
+    assert tree.definition('autoapi.summary.summarize') == \
+        (summary, 'functions')
+    assert tree.definition('autoapi.apinode.APINode') is None
+    assert tree.lookup_object(summarize) == [(summary, 'functions')]
+
+    assert tree.owner('autoapi.apinode.APINode') == (tree, 'APINode')
+    assert tree.owner('autoapi.summary.summarize') == (summary, 'summarize')
+    assert tree.owner('autoapi.missing') is None
+
+    built = APINode.build('autoapi', jobs=2)
+    assert built.lookup_qualname('autoapi.apinode.APINode') == \
+        [(built, 'classes')]
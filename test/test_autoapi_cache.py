@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.cache.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from os import stat, utime
+
+import pytest  # noqa
+
+from autoapi import APINode
+from autoapi.cache import APICache
+
+
+def test_cache(tmpdir):
+    """
+    Check that unchanged modules are loaded from the cache.
+    """
+    cache = APICache(str(tmpdir.join('cache')))
+
+    first = APINode.build('autoapi', cache=cache)
+    assert cache.hits == 0
+    assert cache.misses == len(first.directory)
+
+    second = APINode.build('autoapi', cache=cache)
+    assert cache.hits == len(first.directory)
+    assert cache.misses == len(first.directory)
+
+    assert second.tree() == first.tree()
+    assert list(second.classes) == ['APINode']
+
+
+def test_cache_dependencies(tmpdir, monkeypatch):
+    """
+    Check that modules re-exporting objects are refreshed when the modules
+    defining them change.
+    """
+    package = tmpdir.mkdir('cachepkg')
+    package.join('__init__.py').write(
+        'from .core import function\n__all__ = [\'function\']\n'
+    )
+    core = package.join('core.py')
+    core.write('def function():\n    """Before."""\n')
+    package.join('other.py').write('')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    cache = APICache(str(tmpdir.join('cache')))
+    APINode.build('cachepkg', static=True, cache=cache)
+
+    core.write('def function():\n    """After."""\n')
+    mtime = stat(str(core)).st_mtime_ns + 10 ** 9
+    utime(str(core), ns=(mtime, mtime))
+
+    cache.hits = cache.misses = 0
+    tree = APINode.build('cachepkg', static=True, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert tree.functions['function'].summary == 'After.'
+
+
+@pytest.mark.parametrize('static', [True, False])
+def test_cache_variables(tmpdir, monkeypatch, static):
+    """
+    Check that modules re-exporting variables are refreshed when the modules
+    defining them change.
+    """
+    name = 'varpkg{}'.format(int(static))
+    package = tmpdir.mkdir(name)
+    package.join('__init__.py').write(
+        'from .consts import X, Y\n'
+        'Z = Y\n'
+        '__all__ = [\'X\', \'Z\']\n'
+    )
+    consts = package.join('consts.py')
+    consts.write('__all__ = [\'X\']\nX = 1\nY = 1\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    cache = APICache(str(tmpdir.join('cache')))
+    APINode.build(name, static=static, cache=cache, restore=True)
+
+    consts.write('__all__ = [\'X\']\nX = 2222\nY = 3333\n')
+    mtime = stat(str(consts)).st_mtime_ns + 10 ** 9
+    utime(str(consts), ns=(mtime, mtime))
+
+    cache.hits = cache.misses = 0
+    tree = APINode.build(name, static=static, cache=cache, restore=True)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert repr(tree.variables['X']) == '2222'
+    assert repr(tree.variables['Z']) == '3333'
+    assert repr(tree.get_module(name + '.consts').variables['X']) == '2222'
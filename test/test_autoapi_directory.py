@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.directory.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import pytest  # noqa
+
+from autoapi import APINode
+from autoapi.directory import Directory
+
+
+def test_directory():
+    """
+    Check the queries by prefix of the directory.
+    """
+    directory = Directory(
+        (name, name) for name in [
+            'a', 'a.b', 'a.b.c', 'a.b.c.d', 'a.bc', 'a.b0', 'a.e',
+        ]
+    )
+
+    assert list(directory.descendants('a.b')) == ['a.b.c', 'a.b.c.d']
+    assert list(directory.descendants('a')) == [
+        'a.b', 'a.b.c', 'a.b.c.d', 'a.b0', 'a.bc', 'a.e',
+    ]
+    assert list(directory.descendants('a.x')) == []
+    assert directory.ancestors('a.b.x.y') == ['a.b', 'a']
+    assert directory.ancestors('a') == []
+    assert directory.subtree_size('a.b') == 3
+    assert directory.subtree_size('a') == 7
+    assert directory.subtree_size('a.x') == 0
+
+    directory['a.b.x'] = 'a.b.x'
+    del directory['a.b.c.d']
+    assert list(directory.descendants('a.b')) == ['a.b.c', 'a.b.x']
+
+    tree = APINode('autoapi')
+    assert isinstance(tree.directory, Directory)
+    assert tree.directory.subtree_size('autoapi') == len(tree.directory)
+    assert list(tree.directory.descendants('autoapi')) == \
+        list(tree.preorder())[1:]
+    assert tree.directory.ancestors('autoapi.apinode.APINode') == [
+        tree.get_module('autoapi.apinode'), tree,
+    ]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.filters.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import re
+import sys
+
+import pytest  # noqa
+
+from autoapi import APINode
+from autoapi.filters import ModuleFilter
+
+
+def test_module_filter():
+    """
+    Check the selection of modules by patterns and depth.
+    """
+    assert ModuleFilter.create('pkg') is None
+
+    selected = ModuleFilter(
+        'pkg', include=['pkg.api*', re.compile(r'pkg\.util(\..*)?')],
+        exclude=['*.tests'], max_depth=2,
+    )
+    assert selected('pkg')
+    assert selected('pkg.api')
+    assert selected('pkg.api.core')
+    assert selected('pkg.util.strings')
+    assert not selected('pkg.utils')
+    assert not selected('pkg.api.tests')
+    assert not selected('pkg.api.core.deep')
+
+
+@pytest.mark.parametrize('jobs', [None, 2])
+def test_filtered_tree(tmpdir, monkeypatch, jobs):
+    """
+    Check that filtered submodules are never imported.
+    """
+    package = tmpdir.mkdir('filterpkg')
+    package.join('__init__.py').write('')
+    package.join('broken.py').write('raise RuntimeError()\n')
+    api = package.mkdir('api')
+    api.join('__init__.py').write('')
+    api.join('core.py').write('')
+    tests = api.mkdir('tests')
+    tests.join('__init__.py').write('raise RuntimeError()\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    tree = APINode.build(
+        'filterpkg', jobs=jobs,
+        include=['filterpkg.api*'], exclude=['*.tests'],
+    )
+    assert list(tree.directory) == [
+        'filterpkg', 'filterpkg.api', 'filterpkg.api.core',
+    ]
+    assert not tree.subnodes_failed
+    assert 'filterpkg.api.tests' not in sys.modules
+
+    tree = APINode.build('filterpkg', jobs=jobs, max_depth=1)
+    assert list(tree.directory) == ['filterpkg', 'filterpkg.api']
+    assert tree.subnodes_failed == ['filterpkg.broken']
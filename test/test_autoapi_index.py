@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.index.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import pytest
+
+from autoapi import APINode
+from autoapi.index import load, save
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_index(tmpdir, binary):
+    """
+    Check that a saved index loads into an equivalent read-only tree.
+    """
+    tree = APINode('autoapi')
+    path = str(tmpdir.join('index'))
+
+    save(tree, path, binary=binary)
+    loaded = load(path)
+
+    assert list(loaded.directory) == list(tree.directory)
+    assert loaded.tree() == tree.tree()
+    assert loaded.is_root()
+    assert loaded.is_relevant()
+    assert [
+        node.name for node, leaves in loaded.walk()
+    ] == [
+        node.name for node, leaves in tree.walk()
+    ]
+
+    node = loaded.get_module('autoapi')
+    obj = node.classes['APINode']
+    assert obj.__module__ == 'autoapi.apinode'
+    assert obj.__doc__ == 'Tree node class for module instrospection.'
+
+    with pytest.raises(TypeError):
+        node.classes['Other'] = obj
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.profiling.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import tracemalloc
+
+import pytest
+
+from autoapi import APINode
+from autoapi.profiling import Profiler
+
+
+@pytest.mark.parametrize('jobs', [None, 2])
+def test_profiler(jobs):
+    """
+    Check that all nodes and phases are recorded.
+    """
+    profiler = Profiler(memory=True)
+    records = []
+    profiler.subscribe(lambda *record: records.append(record))
+
+    tree = APINode.build('autoapi', jobs=jobs, profiler=profiler)
+
+    assert list(profiler.records) == list(tree.directory)
+    assert 'relevance' in profiler.records['autoapi']
+    for phases in profiler.records.values():
+        assert {'import', 'extract'} <= set(phases)
+        for measure in phases.values():
+            assert measure['time'] >= 0
+            assert measure['memory'] is not None
+
+    assert len(records) == sum(
+        len(phases) for phases in profiler.records.values()
+    )
+
+    report = profiler.report()
+    assert report['totals']['import'] > 0
+    assert report['totals']['render'] == 0
+
+    top = profiler.top(2)
+    assert len(top) == 2
+    assert top[0][2] >= top[1][2]
+
+    assert tracemalloc.is_tracing()
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
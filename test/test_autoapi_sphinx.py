@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.sphinx.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from os import stat
+
+import pytest
+
+from sphinx.application import Sphinx
+
+
+@pytest.fixture
+def project(tmpdir):
+    """
+    Sphinx project documenting the autoapi package.
+    """
+    srcdir = tmpdir.mkdir('src')
+    srcdir.join('conf.py').write(
+        "extensions = ['autoapi.sphinx']\n"
+        "autoapi_modules = {'autoapi': None}\n"
+    )
+    srcdir.join('index.rst').write('Index\n=====\n')
+
+    def init(**overrides):
+        return Sphinx(
+            str(srcdir), str(srcdir),
+            str(tmpdir.join('out')), str(tmpdir.join('doctrees')),
+            'dummy', confoverrides=overrides, status=None,
+        )
+
+    init.srcdir = srcdir
+    return init
+
+
+def test_unchanged_pages(project):
+    """
+    Check that unchanged pages are not rewritten and stale pages are removed.
+    """
+    project()
+
+    page = project.srcdir.join('autoapi', 'autoapi.rst')
+    assert page.check()
+    mtime = stat(str(page)).st_mtime_ns
+
+    stale = project.srcdir.join('autoapi', 'autoapi.removed.rst')
+    stale.write('Removed\n=======\n')
+    other = project.srcdir.join('autoapi', 'other.rst')
+    other.write('Other\n=====\n')
+
+    project()
+
+    assert stat(str(page)).st_mtime_ns == mtime
+    assert not stale.check()
+    assert other.check()
+
+
+def test_parallel_render(project):
+    """
+    Check that rendering the pages in parallel produces the same output.
+    """
+    project()
+    pages = project.srcdir.join('autoapi')
+    serial = {page.basename: page.read() for page in pages.listdir()}
+
+    pages.remove()
+    project(autoapi_modules={'autoapi': {'jobs': 2}})
+    parallel = {page.basename: page.read() for page in pages.listdir()}
+
+    assert parallel == serial
+
+    from autoapi.sphinx import APINode, is_portable
+    assert all(map(is_portable, APINode.build('autoapi', jobs=2).preorder()))
+    assert not is_portable(APINode('autoapi'))
+
+
+def test_profile(project, tmpdir):
+    """
+    Check that the profiling report is written.
+    """
+    app = project(autoapi_profile='profile.json')
+
+    report = tmpdir.join('out', 'profile.json')
+    assert report.check()
+    assert 'render' in report.read()
+    assert app
+
+
+def test_template_cache(project):
+    """
+    Check that compiled templates are stored in the cache directory.
+    """
+    project(autoapi_cache='cache')
+    page = project.srcdir.join('autoapi', 'autoapi.rst')
+    content = page.read()
+
+    bytecode = project.srcdir.join('cache', 'templates')
+    assert len(bytecode.listdir()) == 1
+
+    page.remove()
+    project(autoapi_cache='cache')
+    assert page.read() == content
+
+
+def test_overlapping_modules(project, monkeypatch):
+    """
+    Check that overlapping modules reuse the nodes of the same tree.
+    """
+    from autoapi.sphinx import APINode
+
+    built = []
+    build = APINode.build
+
+    def record(name, **kwargs):
+        built.append(name)
+        return build(name, **kwargs)
+
+    monkeypatch.setattr(APINode, 'build', record)
+    project(autoapi_modules={
+        'autoapi.sphinx': {'output': 'sphinx'},
+        'autoapi': None,
+    })
+
+    assert built == ['autoapi']
+    pages = project.srcdir.join('sphinx').listdir()
+    assert [page.basename for page in pages] == ['autoapi.sphinx.rst']
+    assert project.srcdir.join('sphinx', 'autoapi.sphinx.rst').read() == \
+        project.srcdir.join('autoapi', 'autoapi.sphinx.rst').read()
+
+    built.clear()
+    project(autoapi_modules={
+        'autoapi.sphinx': {'output': 'sphinx', 'light': True},
+        'autoapi': None,
+    })
+    assert built == ['autoapi', 'autoapi.sphinx']
+
+
+def test_write_page(tmpdir):
+    """
+    Check that pages are compared and written chunk by chunk.
+    """
+    from autoapi.sphinx import write_page
+
+    page = str(tmpdir.join('page.rst'))
+    assert write_page(page, iter(['Title\n', '=====\n']))
+    assert not write_page(page, iter(['Tit', 'le\n=====\n']))
+    assert write_page(page, iter(['Title\n', '=====\n', 'More\n']))
+    assert write_page(page, iter(['Title\n']))
+    assert not write_page(page, 'Title\n')
+    assert write_page(page, iter(['Other\n']))
+    assert tmpdir.join('page.rst').read() == 'Other\n'
+    assert tmpdir.listdir() == [tmpdir.join('page.rst')]
+
+    def failing():
+        yield 'Failed\n'
+        raise RuntimeError('Rendering failed')
+
+    with pytest.raises(RuntimeError):
+        write_page(page, failing())
+    assert tmpdir.join('page.rst').read() == 'Other\n'
+    assert tmpdir.listdir() == [tmpdir.join('page.rst')]
+
+
+def test_diagrams(project):
+    """
+    Check the options of the inheritance diagrams.
+    """
+    page = project.srcdir.join('autoapi', 'autoapi.workers.rst')
+
+    project()
+    assert page.read().count('inheritance-diagram::') == 2
+
+    project(autoapi_modules={
+        'autoapi': {'diagrams': 'module', 'diagrams_max': 1},
+    })
+    content = page.read()
+    assert content.count('inheritance-diagram::') == 1
+    assert '.. inheritance-diagram:: WorkerPool\n' in content
+
+    project(autoapi_modules={'autoapi': {'diagrams_skip_trivial': True}})
+    assert 'inheritance-diagram::' not in page.read()
+
+    project(autoapi_modules={'autoapi': {'diagrams': 'none'}})
+    assert 'inheritance-diagram::' not in page.read()
+
+    project(autoapi_modules={'autoapi': {'diagrams': 'modules'}})
+    assert page.read().count('inheritance-diagram::') == 2
+
+
+def test_stream(project):
+    """
+    Check that streamed pages match the pages of the built tree.
+    """
+    project(autoapi_modules={'autoapi': {'prune': True}})
+    outdir = project.srcdir.join('autoapi')
+    built = {page.basename: page.read() for page in outdir.listdir()}
+
+    outdir.remove()
+    project(autoapi_modules={'autoapi': {'prune': True, 'stream': True}})
+    streamed = {page.basename: page.read() for page in outdir.listdir()}
+
+    assert streamed == built
+
+
+def test_dedupe(project, tmpdir, monkeypatch):
+    """
+    Check that re-exported objects are only documented by their owner.
+    """
+    package = tmpdir.mkdir('dedupepkg')
+    package.join('__init__.py').write(
+        'from .sub import function, Class\n'
+        '__all__ = [\'function\', \'Class\']\n'
+    )
+    package.join('sub.py').write(
+        '__all__ = [\'function\', \'Class\']\n'
+        'def function():\n'
+        '    """Function."""\n'
+        'class Class(object):\n'
+        '    """Class."""\n'
+    )
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    project(autoapi_modules={'dedupepkg': {'dedupe': True}})
+    outdir = project.srcdir.join('dedupepkg')
+    package = outdir.join('dedupepkg.rst').read()
+    sub = outdir.join('dedupepkg.sub.rst').read()
+
+    assert '- :py:func:`~dedupepkg.sub.function`:\n  Function.' in package
+    assert '- :py:class:`~dedupepkg.sub.Class`:\n  Class.' in package
+    assert '.. autofunction::' not in package
+    assert '.. autoclass::' not in package
+    assert 'inheritance-diagram' not in package
+
+    assert '.. autofunction:: function' in sub
+    assert '.. autoclass:: Class' in sub
+    assert 'inheritance-diagram:: Class' in sub
+
+
+@pytest.mark.parametrize('options', [{'jobs': 2}, {'light': True}])
+def test_same_pages(project, options):
+    """
+    Check that the pages rendered from stand-ins of the objects are the same
+    as the pages rendered from the objects.
+    """
+    project(autoapi_modules={'email': None})
+    outdir = project.srcdir.join('email')
+    default = {page.basename: page.read() for page in outdir.listdir()}
+
+    outdir.remove()
+    project(autoapi_modules={'email': options})
+    other = {page.basename: page.read() for page in outdir.listdir()}
+
+    assert other == default
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.static.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import sys
+from textwrap import dedent
+from inspect import cleandoc, getdoc
+
+import pytest  # noqa
+
+from autoapi import APINode
+from autoapi.static import StaticAnalyzer
+
+
+def test_static_tree():
+    """
+    Check that the static analysis matches the imported tree.
+    """
+    imported = APINode('autoapi')
+    static = APINode('autoapi', static=True)
+
+    assert list(static.directory) == list(imported.directory)
+
+    for name, node in imported.directory.items():
+        other = static.get_module(name)
+        for category, elements in node.api.items():
+            assert list(other.api[category]) == list(elements)
+
+
+def test_static_fallback(tmpdir, monkeypatch):
+    """
+    Check that modules are only imported when the listing is dynamic.
+    """
+    package = tmpdir.mkdir('staticpkg')
+    package.join('__init__.py').write(dedent("""
+        from .core import Base, BaseError, helper
+
+        __all__ = ['Base', 'BaseError', 'helper', 'VALUE']
+
+        VALUE = {'a': 1}
+    """))
+    package.join('core.py').write(dedent("""
+        class Base(object):
+            '''Base class.'''
+
+        class BaseError(ValueError):
+            pass
+
+        def helper():
+            pass
+
+        __all__ = ['Base', 'BaseError', 'helper']
+    """))
+    tmpdir.join('staticdyn.py').write(dedent("""
+        def dynamic():
+            pass
+
+        __all__ = [name for name in ['dynamic']]
+    """))
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    tree = APINode('staticpkg', static=True)
+
+    assert tree.module is None
+    assert list(tree.classes) == ['Base']
+    assert list(tree.exceptions) == ['BaseError']
+    assert list(tree.functions) == ['helper']
+    assert tree.variables['VALUE'] == {'a': 1}
+    assert tree.classes['Base'].__doc__ == 'Base class.'
+
+    assert tree.get_module('staticpkg.core').module is None
+    assert 'staticpkg' not in sys.modules
+    assert 'staticpkg.core' not in sys.modules
+
+    dynamic = APINode('staticdyn', static=True)
+    assert dynamic.module is not None
+    assert list(dynamic.functions) == ['dynamic']
+
+
+def test_meta_path_finder(tmpdir, monkeypatch):
+    """
+    Check that packages found by other meta path finders keep their
+    submodules.
+    """
+    from importlib.abc import MetaPathFinder
+    from importlib.util import spec_from_file_location
+
+    package = tmpdir.mkdir('elsewhere').mkdir('edpkg')
+    package.join('__init__.py').write('')
+    package.join('sub.py').write('__all__ = [\'VALUE\']\nVALUE = 1\n')
+
+    class Finder(MetaPathFinder):
+        def find_spec(self, name, path, target=None):
+            if name != 'edpkg':
+                return None
+            return spec_from_file_location(
+                name, str(package.join('__init__.py')),
+                submodule_search_locations=[str(package)],
+            )
+
+    monkeypatch.setattr(sys, 'meta_path', sys.meta_path + [Finder()])
+    for name in ('edpkg', 'edpkg.sub'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    expected = ['edpkg', 'edpkg.sub']
+    assert list(APINode('edpkg').directory) == expected
+    assert list(APINode.build('edpkg', jobs=2).directory) == expected
+    assert list(APINode('edpkg', static=True).directory) == expected
+
+
+def test_static_aliases(tmpdir, monkeypatch):
+    """
+    Check that aliases are resolved and other expressions are imported.
+    """
+    tmpdir.join('staticalias.py').write(dedent("""
+        class Base(object):
+            '''Base class.'''
+
+        OldName = Base
+        OTHER = OldName
+
+        __all__ = ['Base', 'OldName', 'OTHER']
+    """))
+    tmpdir.join('staticcall.py').write(dedent("""
+        def factory():
+            return factory
+
+        created = factory()
+
+        __all__ = ['created']
+    """))
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    tree = APINode('staticalias', static=True)
+    assert tree.module is None
+    assert list(tree.classes) == ['Base', 'OldName', 'OTHER']
+    assert tree.classes['OldName'].__name__ == 'Base'
+
+    called = APINode('staticcall', static=True)
+    assert called.module is not None
+    assert list(called.functions) == ['created']
+
+
+def test_static_origins(tmpdir, monkeypatch):
+    """
+    Check that the modules defining re-exported variables are found.
+    """
+    package = tmpdir.mkdir('originpkg')
+    package.join('__init__.py').write(dedent("""
+        from .middle import VALUE
+        from .consts import BASE
+        from . import computed
+
+        ALIAS = VALUE
+        TOTAL = computed.TOTAL
+    """))
+    package.join('middle.py').write('from .consts import VALUE\n')
+    package.join('consts.py').write('VALUE = 1\nBASE = 2\n')
+    package.join('computed.py').write('TOTAL = 3\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    analyzer = StaticAnalyzer()
+    names = ['VALUE', 'ALIAS', 'TOTAL', 'MISSING']
+    assert analyzer.origins('originpkg', names) == {
+        'VALUE': 'originpkg.consts',
+        'ALIAS': 'originpkg.consts',
+        'TOTAL': 'originpkg',
+    }
+    assert analyzer.dependencies('originpkg', ['ALIAS']) == {
+        'originpkg.middle', 'originpkg.consts',
+    }
+    assert analyzer.dependencies('originpkg', ['TOTAL']) == {
+        'originpkg.middle', 'originpkg.middle.VALUE',
+        'originpkg.consts', 'originpkg.consts.BASE',
+        'originpkg.computed',
+    }
+    assert analyzer.dependencies('originpkg', ['MISSING']) == \
+        analyzer.dependencies('originpkg', ['TOTAL'])
+
+
+def test_static_uncertain(tmpdir, monkeypatch):
+    """
+    Check that modules whose public objects depend on their execution are
+    imported, and that undocumented classes inherit their docstrings.
+    """
+    tmpdir.join('staticspeedups.py').write('def fast():\n    pass\n')
+    tmpdir.join('staticdecorated.py').write(dedent("""
+        from functools import lru_cache
+
+        @lru_cache()
+        def cached():
+            pass
+
+        __all__ = ['cached']
+    """))
+    tmpdir.join('staticfallback.py').write(dedent("""
+        try:
+            from staticspeedups import fast
+        except ImportError:
+            def fast():
+                pass
+
+        __all__ = ['fast']
+    """))
+    tmpdir.join('staticstar.py').write(dedent("""
+        def fast():
+            pass
+
+        from staticspeedups import *
+
+        __all__ = ['fast']
+    """))
+    tmpdir.join('staticinherited.py').write(dedent("""
+        class Base(object):
+            '''Base doc.'''
+
+        class Child(Base):
+            pass
+
+        class Error(ValueError):
+            pass
+
+        Alias = Child
+
+        __all__ = ['Alias', 'Error']
+    """))
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    for name in ['staticdecorated', 'staticfallback', 'staticstar']:
+        static = APINode(name, static=True)
+        imported = APINode(name)
+        assert static.module is not None
+        assert {
+            category: list(elements)
+            for category, elements in static.api.items()
+        } == {
+            category: list(elements)
+            for category, elements in imported.api.items()
+        }
+
+    static = APINode('staticinherited', static=True)
+    imported = APINode('staticinherited')
+    assert static.module is None
+    assert static.classes['Alias'].summary == 'Base doc.'
+    for category in ['classes', 'exceptions']:
+        for obj_name, obj in imported.api[category].items():
+            doc = static.api[category][obj_name].__doc__
+            assert cleandoc(doc) == getdoc(obj)
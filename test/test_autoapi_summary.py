@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.summary.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import gc
+
+import pytest  # noqa
+
+from autoapi.static import StaticObject
+from autoapi.summary import SummaryCache, summarize
+
+
+def test_summary_cache():
+    """
+    Check that summaries are memoized by identity and bounded.
+    """
+    def function():
+        """
+        First line.
+
+        Second line.
+        """
+
+    assert StaticObject(
+        'function', 'module', 'function', doc=function.__doc__,
+    ).summary == 'First line.'
+
+    cache = SummaryCache(size=2)
+    assert cache.get(function) == 'First line.'
+
+    function.__doc__ = 'Changed.'
+    assert summarize(function) == 'Changed.'
+    assert cache.get(function) == 'First line.'
+
+    del function
+    gc.collect()
+    assert not cache._weak
+
+    # Objects without weak references support
+    class Slotted(object):
+        """
+        Slotted summary.
+        """
+        __slots__ = ()
+
+    first, second, third = Slotted(), Slotted(), Slotted()
+    for obj in (first, second, third):
+        assert cache.get(obj) == 'Slotted summary.'
+    assert [entry[0] for entry in cache._strong.values()] == [second, third]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.values.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from pprint import pformat
+
+import pytest
+
+from autoapi.values import render_value
+
+
+@pytest.mark.parametrize('value', [
+    None, 1, 'text', (), (1,), [], {}, set(), frozenset(),
+    {'b': [1, 2], 'a': {'x': list(range(30)), 'y': 'z' * 50}},
+    ['a' * 40, 'b' * 40],
+    frozenset(range(40)),
+    {index: {key: list(range(key)) for key in range(5)} for index in range(5)},
+])
+def test_render_value(value):
+    """
+    Check that values within the limits are represented as pprint does.
+    """
+    assert render_value(value) == pformat(value)
+
+
+def test_render_value_limits():
+    """
+    Check that large values are elided.
+    """
+    assert render_value(list(range(1000)), items=3) == '[0, 1, 2, ...]'
+    assert render_value({'a': {'b': {'c': 1}}}, depth=2) == \
+        "{'a': {'b': {...}}}"
+    assert render_value('x' * 10000, chars=10) == "'xxxxxxxxx..."
+
+    large = render_value(list(range(10 ** 5)), chars=100, items=10 ** 5)
+    assert len(large) == 103
+    assert large.endswith('...')
+
+    # Integers too large to be converted to decimal are still represented
+    huge = render_value([10 ** 5000], chars=20)
+    assert len(huge) == 23
+    assert huge.startswith('[')
+
+    # Only the elements shown are sorted
+    keys = list(range(10 ** 5))[::-1]
+    assert render_value(dict.fromkeys(keys, 0), items=2) == '{0: 0, 1: 0, ...}'
+    assert render_value(set(keys), items=2) == '{0, 1, ...}'
+    assert render_value({'a': 1, 0: 2, 'b': 3}, items=2) == \
+        "{'a': 1, 0: 2, ...}"
+
+
+def test_render_value_subclasses():
+    """
+    Check that containers with their own representation are traversed.
+    """
+    from collections import Counter, OrderedDict, deque, namedtuple
+
+    assert render_value(OrderedDict([('b', 1), ('a', 2)])) == \
+        "OrderedDict({'b': 1, 'a': 2})"
+    assert render_value(Counter('aab')) == "Counter({'a': 2, 'b': 1})"
+    assert render_value(namedtuple('Point', 'x y')(1, 2)) == 'Point(x=1, y=2)'
+    assert render_value(deque(range(1000)), items=3) == 'deque([0, 1, 2, ...])'
+
+    large = OrderedDict((index, index) for index in range(10 ** 5))
+    assert render_value(large, items=2) == 'OrderedDict({0: 0, 1: 1, ...})'
+    assert len(render_value(large, chars=100, items=10 ** 5)) == 103
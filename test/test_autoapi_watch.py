@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.watch.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+from os import stat, utime
+from shutil import rmtree
+
+import pytest  # noqa
+
+from autoapi.watch import Watcher, create_app
+
+
+CORE = '''
+def function():
+    """
+    {}
+    """
+
+__all__ = ['function']
+'''
+
+
+def test_watcher(tmpdir, monkeypatch):
+    """
+    Check that only the pages of the changed modules and their exporters are
+    written again.
+    """
+    package = tmpdir.mkdir('watchpkg')
+    package.join('__init__.py').write(
+        'from .core import function\n'
+        'from .other import VALUE\n'
+        '__all__ = [\'function\', \'VALUE\']\n'
+    )
+    core = package.join('core.py')
+    core.write(CORE.format('Before.'))
+    other = package.join('other.py')
+    other.write('VALUE = 1\n__all__ = [\'VALUE\']\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    srcdir = tmpdir.mkdir('src')
+    srcdir.join('conf.py').write(
+        "extensions = ['autoapi.sphinx']\n"
+        "autoapi_modules = {'watchpkg': None}\n"
+    )
+    srcdir.join('index.rst').write('Index\n=====\n')
+
+    app, workdir = create_app(str(srcdir))
+    try:
+        watcher = Watcher(app)
+        pages = srcdir.join('watchpkg')
+        assert 'Before.' in pages.join('watchpkg.core.rst').read()
+        assert watcher.poll() == []
+
+        core.write(CORE.format('After.'))
+        mtime = stat(str(core)).st_mtime_ns + 10 ** 9
+        utime(str(core), ns=(mtime, mtime))
+
+        written = sorted(watcher.poll())
+        assert written == [
+            str(pages.join('watchpkg.core.rst')),
+            str(pages.join('watchpkg.rst')),
+        ]
+        assert 'After.' in pages.join('watchpkg.core.rst').read()
+        assert 'After.' in pages.join('watchpkg.rst').read()
+
+        other.write('VALUE = 2222\n__all__ = [\'VALUE\']\n')
+        mtime = stat(str(other)).st_mtime_ns + 10 ** 9
+        utime(str(other), ns=(mtime, mtime))
+
+        written = sorted(watcher.poll())
+        assert written == [
+            str(pages.join('watchpkg.other.rst')),
+            str(pages.join('watchpkg.rst')),
+        ]
+        assert '2222' in pages.join('watchpkg.rst').read()
+
+        package.join('added.py').write('')
+        assert watcher.poll() == []
+        assert pages.join('watchpkg.added.rst').check()
+    finally:
+        rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015-2020 KuraLabs S.R.L
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test suite for module autoapi.workers.
+
+See http://pythontesting.net/framework/pytest/pytest-introduction/#fixtures
+"""
+
+import os
+import time
+
+import pytest  # noqa
+
+from autoapi.workers import WorkerError, WorkerPool
+
+
+def task(action):
+    if action == 'sleep':
+        time.sleep(60)
+    if action == 'crash':
+        os._exit(3)
+    if action == 'exit':
+        raise SystemExit(1)
+    if action == 'large':
+        time.sleep(0.2)
+        return 'x' * 10 ** 7
+    return action
+
+
+def test_worker_pool():
+    """
+    Check that failed tasks are reported and don't affect the others.
+    """
+    actions = ['a', 'sleep', 'b', 'crash', 'c', 'exit', 'd']
+
+    with WorkerPool(2, timeout=2) as pool:
+        results = list(pool.map(task, actions))
+
+    assert [
+        result for result in results if not isinstance(result, WorkerError)
+    ] == ['a', 'b', 'c', 'd']
+
+    assert 'Timed out' in results[1].reason
+    assert 'exit code 3' in results[3].reason
+    assert 'SystemExit' in results[5].reason
+
+
+def test_worker_pool_abandoned():
+    """
+    Check that the pool is closed even if workers are blocked sending the
+    results of an abandoned map.
+    """
+    from threading import Thread
+
+    pool = WorkerPool(2)
+    results = pool.map(task, ['a', 'large'])
+    assert next(results) == 'a'
+    time.sleep(0.5)
+
+    closing = Thread(target=pool.close, daemon=True)
+    closing.start()
+    closing.join(10)
+    assert not closing.is_alive()